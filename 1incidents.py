@@ -0,0 +1,35 @@
+import os
+
+from datastore import save_frame
+from ingest import UMD_WORKBOOK, load_umd_incidents
+from instrument import step
+from streaming import INCIDENT_SOURCES, count_incidents, iter_chunks
+
+# cached: UMD workbook in one piece through the ingest cache
+# stream: every source in chunks, memory bounded by the number of country-years
+# (further sources: CYBERRISK_INCIDENT_SOURCES, see streaming.py)
+INGEST_MODE = os.environ.get("CYBERRISK_INGEST_MODE", "cached")
+COLUMNS = ["country", "year"]
+
+
+def incident_chunks():
+    if INGEST_MODE == "stream":
+        yield from iter_chunks(UMD_WORKBOOK, COLUMNS)
+    else:
+        yield load_umd_incidents(columns=COLUMNS)
+    for path in INCIDENT_SOURCES:
+        print(f"📂 Streaming {path}...")
+        yield from iter_chunks(path, COLUMNS)
+
+
+# === Load UMD and count incidents per country-year
+print(f"📂 Loading UMD dataset ({INGEST_MODE})...")
+with step("count incidents") as s:
+    cyber, unresolved, s.rows_in = count_incidents(incident_chunks())
+    s.rows_out = len(cyber)
+for name, rows in unresolved.items():
+    print(f"⚠️ No ISO3 for {name!r} ({rows} rows dropped) — add it to iso3_aliases.json")
+
+# === Save
+path = save_frame(cyber, "attack_counts", csv=False)
+print(f"✅ Saved {cyber.shape[0]} country-year attack counts to {path}")
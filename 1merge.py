@@ -1,31 +1,29 @@
 import pandas as pd
-import pycountry
 
-def safe_iso3(name):
-    try:
-        return pycountry.countries.lookup(name).alpha_3
-    except:
-        return None
+from datastore import load_frame, save_frame
+from features import add_features
+from incremental import carry_over, rows_to_compute
+from instrument import step
+from streaming import lookup_join
 
-# === Load UMD
-print("📂 Loading UMD dataset...")
-df = pd.read_excel("cyberattacks/UMD Cyber Attacks Dataset.xlsx", engine="openpyxl")
-df = df[["country", "year"]].dropna()
-df = df.rename(columns={"country": "Country", "year": "Year"})
-df["ISO3"] = df["Country"].apply(safe_iso3)
-df = df.dropna(subset=["ISO3", "Year"])
-df["Year"] = df["Year"].astype(int)
-cyber = df.groupby(["ISO3", "Year"]).size().reset_index(name="Attack_Count")
+# === Attack counts (aggregated from the UMD dataset by 1incidents.py)
+print("📂 Loading attack counts...")
+cyber = load_frame("attack_counts")
+cyber["ISO3"] = cyber["ISO3"].astype(str)
 
 # === GDP
 print("💰 Loading GDP...")
-gdp = pd.read_csv("gdp/world_country_gdp_usd.csv")
+with step("load gdp", kind="load") as s:
+    gdp = pd.read_csv("gdp/world_country_gdp_usd.csv")
+    s.rows_out = len(gdp)
 gdp = gdp.rename(columns={"Country Code": "ISO3", "year": "Year"})
 gdp = gdp[["ISO3", "Year", "GDP_USD", "GDP_per_capita_USD"]]
 
 # === Internet
 print("🌐 Loading Internet...")
-net = pd.read_csv("internetusers/Final.csv")
+with step("load internet", kind="load") as s:
+    net = pd.read_csv("internetusers/Final.csv")
+    s.rows_out = len(net)
 net = net.rename(columns={
     "Code": "ISO3",
     "Year": "Year",
@@ -38,20 +36,19 @@ net = net[[
 
 # === Population
 print("👥 Loading Population...")
-pop = pd.read_csv("population/countries_population.csv")
+with step("load population", kind="load") as s:
+    pop = pd.read_csv("population/countries_population.csv")
+    s.rows_out = len(pop)
 pop = pop[[
     "ISO3", "Year", "Population",
     "Population Growth", "Growth Rate (%)", "Decade"
 ]]
 
-# === Merge
+# === Merge (indexed outer join on ISO3 + Year, restricted to the timeframe)
 print("🔗 Merging datasets...")
-df = cyber.merge(gdp, on=["ISO3", "Year"], how="outer")
-df = df.merge(net, on=["ISO3", "Year"], how="outer")
-df = df.merge(pop, on=["ISO3", "Year"], how="outer")
-
-# === Filter timeframe
-df = df[df["Year"].between(2005, 2024)]
+with step("join dimensions", rows_in=len(cyber)) as s:
+    df = lookup_join(cyber, [gdp, net, pop], years=(2005, 2024))
+    s.rows_out = len(df)
 
 # === Fill missing attack counts post-2014
 df.loc[(df["Year"] >= 2014) & (df["Attack_Count"].isna()), "Attack_Count"] = 0
@@ -65,18 +62,23 @@ df.reset_index(drop=True, inplace=True)
 
 # === Calculated Columns
 print("🧠 Generating calculated fields...")
-df["Penetration_Index"] = df["Attack_Count"] / (
-    (df["GDP_per_capita_USD"].fillna(1)) * ((df["Internet_Penetration"].fillna(50) / 100) + 0.01)
-)
-
-df["Digital_Exposure_Index"] = df["Internet_Penetration"] * df["No. of Internet Users"]
-df["Economic_Exposure"] = df["GDP_USD"] / df["No. of Internet Users"]
-df["Connectivity_Score"] = df["Broadband Subscription"] + df["Cellular Subscription"]
-df["Attack_Density"] = df["Attack_Count"] / df["Population"]
-df["Growth_Adjusted_Risk"] = df["Attack_Count"] * df["Growth Rate (%)"]
+# (formulas live in features.py; 2enrich.py reuses these instead of recomputing)
+calculated = [
+    "Penetration_Index",
+    "Digital_Exposure_Index",
+    "Economic_Exposure",
+    "Connectivity_Score",
+    "Attack_Density",
+    "Growth_Adjusted_Risk",
+]
+# (append mode: only country-years whose merged inputs changed)
+changed, previous = rows_to_compute(df, "merged_df", [c for c in df.columns if c not in ("ISO3", "Year")])
+with step("features", rows_in=int(changed.sum())):
+    part = add_features(df[changed], calculated, reuse=False)
+df = carry_over(df, previous, part, calculated)
 
 # === Save
 print("💾 Saving full enriched dataset...")
-df.to_csv("merged_df.csv", index=False)
-print(f"✅ Saved {df.shape[0]} rows to merged_df.csv")
+path = save_frame(df, "merged_df")
+print(f"✅ Saved {df.shape[0]} rows to {path}")
 
@@ -1,68 +1,44 @@
-import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+from classify import gdp_tier, net_group
+from datastore import load_frame, load_json, save_frame, save_json
+from features import add_features
+from incremental import carry_over, rescale, rows_to_compute
+from instrument import step
+from panel import Panel, save_panel
 
 # === Load raw merged dataset
-df = pd.read_csv("merged_df.csv")
+df = load_frame("merged_df")
 df.replace([np.inf, -np.inf], np.nan, inplace=True)
 
 # === Derived Indicators
+# (formulas live in features.py; the exposure / density / connectivity
+# columns already computed by 1merge.py are reused, not recomputed)
 
-# Economic Exposure
-df["Economic_Exposure"] = df["GDP_USD"] / df["Population"]
-df["Log_Economic_Exposure"] = np.log10(df["Economic_Exposure"].replace(0, np.nan))
-
-# Digital Exposure
-df["Digital_Exposure_Index"] = (
-    df["Internet_Penetration"] * df["Cellular Subscription"] * df["Broadband Subscription"]
-)
-df["Digital_Exposure_Index_B"] = df["Digital_Exposure_Index"] / 1e9
-
-# Population log scale
-df["Log_Population"] = np.log10(df["Population"].replace(0, np.nan))
-
-# Attack Density per million
-df["Attack_Density"] = (df["Attack_Count"] / df["Population"]) * 1_000_000
-
-# Growth-Adjusted Risk
-df["Growth_Adjusted_Risk"] = df["Attack_Density"] * df["Population Growth"]
-
-# Connectivity Score
-df["Connectivity_Score"] = (
-    df["Broadband Subscription"] + df["Cellular Subscription"] + df["Internet_Penetration"]
-) / 3
-
-# Adjusted Threat Index
-df["Adjusted_Threat_Index"] = df["Attack_Density"] * (df["Internet_Penetration"] / 100)
-
-# Log transforms
-df["Log_Attack_Count"] = np.log10(df["Attack_Count"].replace(0, np.nan))
-df["Log_GDP_USD"] = np.log10(df["GDP_USD"].replace(0, np.nan))
-df["Log_Internet_Users"] = np.log10(df["No. of Internet Users"].replace(0, np.nan))
+derived = [
+    "Log_Economic_Exposure",
+    "Digital_Exposure_Index_B",
+    "Log_Population",
+    "Adjusted_Threat_Index",
+    "Log_Attack_Count",
+    "Log_GDP_USD",
+    "Log_Internet_Users",
+]
+# (append mode: only country-years whose merged row changed)
+changed, previous = rows_to_compute(df, "merged_fully_enriched", [c for c in df.columns if c not in ("ISO3", "Year")])
+with step("features", rows_in=int(changed.sum())):
+    part = add_features(df[changed], derived)
 
 # === Groupings
 
-def gdp_tier(gdp):
-    if pd.isna(gdp): return "Unknown"
-    if gdp >= 40000: return "High Income"
-    if gdp >= 12000: return "Upper-Middle Income"
-    if gdp >= 4000: return "Lower-Middle Income"
-    return "Low Income"
-
-df["GDP_Tier"] = df["GDP_per_capita_USD"].apply(gdp_tier)
-
-def net_group(pen):
-    if pd.isna(pen): return "Unknown"
-    if pen < 30: return "Emerging"
-    if pen < 70: return "Developing"
-    return "Advanced"
-
-df["Net_Group"] = df["Internet_Penetration"].apply(net_group)
+with step("groupings", rows_in=len(part)):
+    part["GDP_Tier"] = gdp_tier(part["GDP_per_capita_USD"])
+    part["Net_Group"] = net_group(part["Internet_Penetration"])
+df = carry_over(df, previous, part, derived + ["GDP_Tier", "Net_Group"])
 
 # === Normalize selected features
 
-scaler = MinMaxScaler()
-for col in [
+norm_columns = [
     "Adjusted_Threat_Index",
     "Attack_Density",
     "Growth_Adjusted_Risk",
@@ -70,11 +46,22 @@ for col in [
     "Digital_Exposure_Index",
     "GDP_USD",
     "Internet_Penetration"
-]:
-    if col in df.columns:
-        df[f"{col}_Norm"] = scaler.fit_transform(df[[col]].fillna(0))
+]
+# (append mode: bounds are updated from the changed rows; a column is only
+# rescaled in full when its min or max moved)
+with step("normalize", rows_in=len(df)):
+    df, bounds, moved = rescale(df, previous, changed, [col for col in norm_columns if col in df.columns],
+                                bounds=load_json("normalization_bounds") if previous is not None else None)
+if previous is not None:
+    print(f"📏 Bounds moved for {len(moved)} of {len(bounds)} normalized columns: {', '.join(moved) or 'none'}")
+save_json(bounds, "normalization_bounds")
 
 # === Save
-df.to_csv("merged_fully_enriched.csv", index=False)
-print("✅ Enrichment complete → saved as merged_fully_enriched.csv")
+path = save_frame(df, "merged_fully_enriched")
+print(f"✅ Enrichment complete → saved as {path}")
+
+# === Panel cube (ISO3 × Year × numeric columns, memory-mapped by its readers)
+panel = Panel.from_frame(df)
+path = save_panel(panel, "merged_fully_enriched")
+print(f"🧊 Panel {' × '.join(map(str, panel.shape))} → saved as {path}")
 
@@ -0,0 +1,21 @@
+from datastore import load_frame
+from instrument import step
+from modeling import FEATURES, TARGET, train
+
+# === Load the enriched dataset (model inputs only)
+df = load_frame("merged_fully_enriched", columns=["ISO3", "Year", TARGET] + FEATURES)
+
+# === Train, warm-start or reuse the registered model
+print("🧠 Training attack-count model...")
+with step("train", rows_in=len(df)) as s:
+    model, meta = train(df)
+    s.cache = "hit" if meta["status"] == "reused" else "miss"
+
+print(f"✅ Model {meta['name']} {meta['version']} ({meta['status']}, backend {meta['backend']}, {meta['train_seconds']:.2f}s)")
+print(f"📉 Mean Absolute Error: {meta['metrics']['mae']:.2f} on {meta['n_test']} held-out rows")
+
+# === Serving budget report
+budget = meta["budget"]
+mark = "✅" if budget["within_budget"] else "⚠️"
+print(f"{mark} Model size {budget['model_bytes'] / 1e6:.2f} MB (budget {budget['max_model_bytes'] / 1e6:.2f} MB), "
+      f"predict {budget['predict_ms']:.1f} ms per {budget['predict_batch_rows']} rows (budget {budget['max_predict_ms']:.0f} ms)")
@@ -1,32 +1,28 @@
-import pandas as pd
 import numpy as np
 
+from classify import classify_risk
+from datastore import load_frame, save_frame
+from incremental import carry_over, rows_to_compute
+
 # === Load file from ML prediction step
-df = pd.read_csv("merged_with_predictions.csv")
+df = load_frame("merged_with_predictions")
+
+# Append mode: the row-wise metrics below only for rows whose inputs changed
+changed, previous = rows_to_compute(df, "predictions_enriched", [
+    "Prediction_Error", "Predicted_Attack_Count", "GDP_per_capita_USD", "Internet_Penetration"
+])
+part = df[changed].copy()
 
 # === GDP Risk Ratio
-df["GDP_Risk_Ratio"] = df["Prediction_Error"] / df["GDP_per_capita_USD"]
+part["GDP_Risk_Ratio"] = part["Prediction_Error"] / part["GDP_per_capita_USD"]
 
 # === Transparency Flag
-df["Transparency_Flag"] = np.where(
-    (df["Prediction_Error"] < -25) & (df["Internet_Penetration"] > 60),
+part["Transparency_Flag"] = np.where(
+    (part["Prediction_Error"] < -25) & (part["Internet_Penetration"] > 60),
     "Suspicious Underreporting",
     "Normal"
 )
 
-# === Risk Class based on absolute error bands
-def classify_risk(error):
-    if pd.isna(error):
-        return "Unknown"
-    elif error < -50:
-        return "Underpredicted"
-    elif error > 50:
-        return "Overpredicted"
-    else:
-        return "Within Model Range"
-
-df["Risk_Class"] = df["Prediction_Error"].apply(classify_risk)
-
 # === Log Transform Safely (Clip or set invalid to NaN)
 def safe_log(series):
     # Convert <=0 to NaN, so log10 doesn't break
@@ -36,11 +32,17 @@ def safe_log(series):
         np.log10(series)
     )
 
-df["Log_Predicted_Attack_Count"] = safe_log(df["Predicted_Attack_Count"])
-df["Log_GDP_Risk_Ratio"] = safe_log(df["GDP_Risk_Ratio"])
+part["Log_Predicted_Attack_Count"] = safe_log(part["Predicted_Attack_Count"])
+part["Log_GDP_Risk_Ratio"] = safe_log(part["GDP_Risk_Ratio"])
+df = carry_over(df, previous, part, [
+    "GDP_Risk_Ratio", "Transparency_Flag", "Log_Predicted_Attack_Count", "Log_GDP_Risk_Ratio"
+])
+
+# === Risk Class (shared thresholds, see classify.py; method="absolute" gives the old ±50 bands)
+# (the band depends on every row's error, so always over all rows)
+df["Risk_Class"] = classify_risk(df["Prediction_Error"])
 
 # === Save the enhanced version to a new file
-output_file = "predictions_enriched.csv"
-df.to_csv(output_file, index=False)
+output_file = save_frame(df, "predictions_enriched")
 print(f"✅ Custom metrics added → saved to {output_file}")
 
@@ -1,66 +1,34 @@
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-
-# === 1. Betöltés
-df = pd.read_csv("merged_fully_enriched.csv")  # <- ezt állítsd be saját útvonaladra
+import os
 
-# === 2. Feature lista (csak SAFE bemenetek!)
-features = [
-    "GDP_per_capita_USD",
-    "GDP_USD",
-    "Internet_Penetration",
-    "Population",
-    "Population Growth",
-    "Growth Rate (%)",
-    "No. of Internet Users",
-    "Cellular Subscription",
-    "Broadband Subscription",
-    "Connectivity_Score",
-    "Digital_Exposure_Index",
-    "Economic_Exposure"
-]
+import numpy as np
 
-# === 3. Célváltozó és tisztítás
-df = df.dropna(subset=["Attack_Count"]).copy()
-X = df[features].replace([np.inf, -np.inf], np.nan).fillna(0).clip(-1e9, 1e9)
-y = df["Attack_Count"]
+from datastore import save_frame
+from instrument import step
+from modeling import FEATURES as features, load_model, predict
+from panel import load_panel
+from projection import project_packed
 
-# === 4. Modell betanítása
-X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=42)
-model = RandomForestRegressor(n_estimators=200, random_state=42)
-model.fit(X_train, y_train)
+# Extrapolátor: linear | log_linear | damped | ridge (lásd projection.py)
+PROJECTION_METHOD = os.environ.get("CYBERRISK_PROJECTION", "linear")
 
-# === 5. Jövőbeli bemenetek előállítása (2025–2030)
-recent_years = df[df["Year"] >= 2018]
-future_rows = []
+# === 1-2. Betöltés: a 2enrich.py által mentett panel kocka (memory-mapped, nincs merge / szűrés)
+panel = load_panel("merged_fully_enriched")
 
-for iso in recent_years["ISO3"].unique():
-    country_data = recent_years[recent_years["ISO3"] == iso].sort_values("Year")
-    if len(country_data) < 2:
-        continue
+# === 3. Célváltozó: csak az ismert Attack_Count-ú ország-évek
+observed = ~np.isnan(panel.feature("Attack_Count"))
 
-    feature_deltas = {}
-    for feat in features:
-        series = country_data[feat]
-        delta = series.diff().mean()
-        last_value = series.iloc[-1]
-        feature_deltas[feat] = (last_value, delta)
+# === 4. Modell betöltése (3train_model.py tanítja be)
+model, meta = load_model()
 
-    last_year = country_data["Year"].max()
-    for year in range(2025, 2031):
-        row = {"ISO3": iso, "Year": year}
-        for feat in features:
-            base, delta = feature_deltas[feat]
-            projected = base + (year - last_year) * delta
-            row[feat] = max(projected, 0)
-        future_rows.append(row)
+# === 5. Jövőbeli bemenetek előállítása (2025–2030), egy vektorizált lépésben
+with step("project", rows_in=int((panel.mask & observed)[:, max(0, 2018 - panel.first_year):].sum())) as s:
+    history = panel.pack(features, start=2018, where=observed)
+    future_df = project_packed(history, features, horizon=range(2025, 2031), method=PROJECTION_METHOD)
+    s.rows_out = len(future_df)
 
 # === 6. Predikció futtatása
-future_df = pd.DataFrame(future_rows)
-X_future = future_df[features].replace([np.inf, -np.inf], np.nan).fillna(0).clip(-1e9, 1e9)
-future_df["Predicted_Attack_Count"] = model.predict(X_future)
+with step("predict", rows_in=len(future_df)):
+    future_df["Predicted_Attack_Count"] = predict(model, future_df)
 
 # === 7. GDP_Risk_Ratio kiszámítása
 future_df["GDP_Risk_Ratio"] = future_df["Predicted_Attack_Count"] / future_df["GDP_USD"]
@@ -68,5 +36,5 @@ future_df["GDP_Risk_Ratio"].replace([np.inf, -np.inf], np.nan, inplace=True)
 future_df["GDP_Risk_Ratio"] = future_df["GDP_Risk_Ratio"].fillna(0)
 
 # === 8. Mentés
-future_df.to_csv("future_predictions.csv", index=False)
-print("✅ Predikció mentve: future_predictions.csv")
+path = save_frame(future_df, "future_predictions")
+print(f"✅ Predikció mentve: {path}")
@@ -0,0 +1,20 @@
+import os
+
+from aggregates import TABLES, build_table, table_name
+from datastore import load_frame, save_frame
+from instrument import step
+
+# === Materialize dashboard lookup tables
+os.makedirs("aggregates", exist_ok=True)
+
+sources = {}
+for table, (source, _) in TABLES.items():
+    if source not in sources:
+        print(f"📂 Loading {source}...")
+        sources[source] = load_frame(source)
+
+    with step(f"build {table}", rows_in=len(sources[source])) as s:
+        result = build_table(table, sources[source])
+        s.rows_out = len(result)
+    path = save_frame(result, table_name(table), csv=False)
+    print(f"✅ {table}: {len(result)} rows → {path}")
@@ -0,0 +1,64 @@
+# === Dashboard lookup tables
+# Per-year top-N lists, tier distributions and yearly totals the dashboard
+# pages used to recompute on every rerun. 6aggregates.py materializes them
+# under aggregates/; the dashboard reads them by (table, year) and only
+# falls back to these builders when the store has not been built.
+
+TOP_N = 10
+PREDICTIONS = "predictions_enriched"
+FORECAST = "future_predictions"
+
+
+def one_row_per_country(df):
+    # Same rule as the pages: first row wins per (Year, ISO3)
+    return df.drop_duplicates(subset=["Year", "ISO3"])
+
+
+def top_n_by_year(df, column, columns, n=TOP_N, ascending=False, dedupe=True):
+    if dedupe:
+        df = one_row_per_country(df)
+    ranked = df.sort_values(column, ascending=ascending, kind="stable").groupby("Year").head(n)
+    ranked = ranked.sort_values(["Year"], kind="stable")[columns].reset_index(drop=True)
+    ranked.insert(1, "Rank", ranked.groupby("Year").cumcount() + 1)
+    return ranked
+
+
+def tier_counts_by_year(df):
+    counts = one_row_per_country(df).groupby("Year")["GDP_Tier"].value_counts().reset_index(name="Count")
+    counts = counts[counts["Count"] > 0].rename(columns={"GDP_Tier": "GDP Tier"})
+    return counts.reset_index(drop=True)
+
+
+def yearly_total(df, column):
+    return df.groupby("Year")[column].sum().reset_index()
+
+
+ERROR_COLUMNS = ["Year", "ISO3", "Attack_Count", "Predicted_Attack_Count", "Prediction_Error", "Transparency_Flag"]
+
+# table name -> (source dataset, builder)
+TABLES = {
+    "top_gdp_per_capita": (PREDICTIONS, lambda df: top_n_by_year(
+        df, "GDP_per_capita_USD", ["Year", "ISO3", "GDP_per_capita_USD"])),
+    "gdp_tier_counts": (PREDICTIONS, tier_counts_by_year),
+    "top_underpredicted": (PREDICTIONS, lambda df: top_n_by_year(
+        df, "Prediction_Error", ERROR_COLUMNS, ascending=True, dedupe=False)),
+    "top_overpredicted": (PREDICTIONS, lambda df: top_n_by_year(
+        df, "Prediction_Error", ERROR_COLUMNS, dedupe=False)),
+    "top_predicted_attacks": (FORECAST, lambda df: top_n_by_year(
+        df, "Predicted_Attack_Count", ["Year", "ISO3", "Predicted_Attack_Count"])),
+    "forecast_trend": (FORECAST, lambda df: yearly_total(df, "Predicted_Attack_Count")),
+}
+
+
+def table_name(table):
+    return f"aggregates/{table}"
+
+
+def build_table(table, df):
+    _, builder = TABLES[table]
+    return builder(df)
+
+
+def split_by_year(table_df):
+    """Index a materialized table as {year: rows} for O(1) lookups."""
+    return {year: rows.reset_index(drop=True) for year, rows in table_df.groupby("Year", sort=True)}
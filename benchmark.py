@@ -0,0 +1,333 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from pipeline import GDP_CSV, INTERNET_CSV, POPULATION_CSV, ROOT, STAGES, UMD_WORKBOOK, file_hash
+from synthetic import INCIDENTS_PER_YEAR, REGIONS, YEARS, generate
+
+# === Benchmark suite
+# Times every pipeline stage, from the xlsx ingest in 1incidents.py on, and
+# every dashboard page's first (cold) and second (cached) render via
+# Streamlit's AppTest, on the bundled inputs (the "bundled" run, our real
+# workload) and on synthetic ones from synthetic.py: at scale N the four
+# inputs have N× the regions and N× the incidents per year of the bundled
+# data (over --years), so the ingest and the incident counting grow with
+# the scale too. 100× is not run by default (the ingest alone takes minutes
+# at 10×); ask for it with --scales. The incidents stage runs twice: in the default mode
+# on a cold ingest cache, and streaming the workbook in chunks. Generated
+# inputs are kept under INPUT_CACHE_DIR, keyed by their parameters and the
+# generator's code. Each stage and page runs in its own process in a
+# scratch workspace, so the recorded peak RSS is that process's own. Every
+# run is appended to a JSON history and can be compared against a saved
+# baseline: a metric regresses when it grows by more than its threshold
+# (and by more than the noise floor).
+
+HISTORY_FILE = "benchmark_history.json"
+BASELINE_FILE = "benchmark_baseline.json"
+SCALES = [1, 10]
+BUNDLED = "bundled"
+BUNDLED_SOURCES = [UMD_WORKBOOK, GDP_CSV, INTERNET_CSV, POPULATION_CSV]
+
+# Allowed relative growth per metric, and the absolute change below which
+# a difference is treated as noise
+THRESHOLDS = {"seconds": 0.25, "cold_seconds": 0.25, "warm_seconds": 0.25, "peak_rss_mb": 0.20}
+NOISE_FLOOR = {"seconds": 0.5, "cold_seconds": 0.5, "warm_seconds": 0.2, "peak_rss_mb": 20.0}
+
+INPUT_CACHE_DIR = os.path.join(ROOT, ".cache", "bench_inputs")
+
+# (name, stage, extra environment): the incidents stage once per ingest mode
+BENCH_RUNS = [(s.name, s, {}) for s in STAGES]
+BENCH_RUNS.insert(1, ("incidents_stream", STAGES[0], {"CYBERRISK_INGEST_MODE": "stream"}))
+
+
+# === Scratch workspace
+
+def scale_label(scale):
+    """Metric key prefix of a run: "bundled" or "10x"."""
+    return scale if scale == BUNDLED else f"{scale}x"
+
+
+def bundled_spec():
+    """The bundled inputs, identified by content (a baseline only compares against the same data)."""
+    return {BUNDLED: {path: file_hash(os.path.join(ROOT, path))[:16] for path in BUNDLED_SOURCES}}
+
+
+def input_spec(scale, years=YEARS, incidents=INCIDENTS_PER_YEAR, seed=0):
+    """synthetic.generate() arguments for one scale."""
+    return {"regions": REGIONS * scale, "years": list(years), "incidents_per_year": incidents * scale, "seed": seed}
+
+
+def source_inputs(spec):
+    """Directory with the synthetic inputs for `spec`, generated on first use."""
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8"))
+    with open(os.path.join(ROOT, "synthetic.py"), "rb") as f:
+        digest.update(f.read())
+    path = os.path.join(INPUT_CACHE_DIR, digest.hexdigest()[:16])
+    if not os.path.isdir(path):
+        print(f"   🧪 Generating {spec['regions']} regions × {spec['years'][0]}–{spec['years'][1]}, "
+              f"~{spec['incidents_per_year']} incidents/year (cached for later runs)...")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        cwd = os.getcwd()
+        try:
+            os.chdir(ROOT)  # the generator samples incident attributes from the bundled workbook
+            generate(tmp, spec["regions"], tuple(spec["years"]), spec["incidents_per_year"], seed=spec["seed"])
+        finally:
+            os.chdir(cwd)
+        os.replace(tmp, path)
+    return path
+
+
+def make_workspace(scale, spec):
+    """Copy the code and the source data for `spec` (bundled or synthetic) into a temp dir."""
+    workspace = tempfile.mkdtemp(prefix=f"cyberrisk-bench-{scale_label(scale)}-")
+    for path in glob.glob(os.path.join(ROOT, "*.py")) + glob.glob(os.path.join(ROOT, "*.json")):
+        shutil.copy(path, workspace)
+    shutil.copytree(os.path.join(ROOT, "dashboard"), os.path.join(workspace, "dashboard"),
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    if BUNDLED in spec:
+        for path in BUNDLED_SOURCES:
+            os.makedirs(os.path.join(workspace, os.path.dirname(path)), exist_ok=True)
+            shutil.copy(os.path.join(ROOT, path), os.path.join(workspace, path))
+    else:
+        # Sources plus the alias file naming the synthetic regions (over the copied one)
+        shutil.copytree(source_inputs(spec), workspace, dirs_exist_ok=True)
+    return workspace
+
+
+# === Measurement
+
+# Children measure their own peak RSS and print it as the last line of
+# output (JSON). VmHWM is reset by exec, unlike the rusage of a child
+# forked from this (already large) process.
+PEAK_RSS = """
+import json, sys
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # kB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+"""
+
+# Run one stage script as __main__
+RUN_STAGE = PEAK_RSS + """
+import runpy
+try:
+    runpy.run_path(sys.argv[1], run_name="__main__")
+finally:
+    print(json.dumps({"peak_rss_mb": peak_rss_mb()}))
+"""
+
+# Render one page twice with AppTest (the second run hits the shared dataset cache)
+RENDER_PAGE = PEAK_RSS + """
+import time
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, "dashboard")
+result = {}
+for run in ["cold_seconds", "warm_seconds"]:
+    start = time.perf_counter()
+    at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+    result[run] = round(time.perf_counter() - start, 3)
+result["exceptions"] = [str(e.value) for e in at.exception]
+result["peak_rss_mb"] = peak_rss_mb()
+print(json.dumps(result))
+"""
+
+
+def run_child(code, arg, cwd, env):
+    """Run a measuring child; returns (returncode, seconds, its JSON report, output)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code, arg], cwd=cwd, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    seconds = round(time.perf_counter() - start, 3)
+    try:
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        report = {}
+    return proc.returncode, seconds, report, proc.stdout
+
+
+def stored_rows(workspace, stage):
+    path = os.path.join(workspace, stage.outputs[0])
+    if path.endswith(".parquet") and os.path.exists(path):
+        import pyarrow.parquet as pq
+        return pq.read_metadata(path).num_rows
+    return None
+
+
+def bench_stages(workspace, env):
+    results = {}
+    for name, stage, extra in BENCH_RUNS:
+        code, seconds, report, output = run_child(RUN_STAGE, stage.script, workspace, dict(env, **extra))
+        rss = report.get("peak_rss_mb")
+        if code != 0:
+            raise RuntimeError(f"{stage.script} failed in {workspace}:\n{output[-2000:]}")
+        results[name] = {"seconds": seconds, "peak_rss_mb": rss, "rows": stored_rows(workspace, stage)}
+        print(f"   ⏱️ {name:<17}{seconds:>8.2f}s {rss or 0:>8.1f} MB")
+    return results
+
+
+def bench_pages(workspace, env):
+    pages = [os.path.join("dashboard", "app.py")] + sorted(glob.glob(os.path.join("dashboard", "pages", "*.py"),
+                                                                    root_dir=workspace))
+    results = {}
+    for page in pages:
+        code, _, timings, output = run_child(RENDER_PAGE, page, workspace, env)
+        if code != 0 or not timings:
+            raise RuntimeError(f"Rendering {page} failed:\n{output[-2000:]}")
+        rss = timings["peak_rss_mb"]
+        if timings["exceptions"]:
+            raise RuntimeError(f"{page} raised: {timings['exceptions'][0]}")
+        name = os.path.splitext(os.path.basename(page))[0]
+        results[name] = {"cold_seconds": timings["cold_seconds"], "warm_seconds": timings["warm_seconds"],
+                         "peak_rss_mb": rss}
+        print(f"   🖥️ {name:<28}{timings['cold_seconds']:>7.2f}s cold {timings['warm_seconds']:>6.2f}s warm"
+              f" {rss or 0:>8.1f} MB")
+    return results
+
+
+def bench_scale(scale, spec, pages=True, keep=False):
+    workspace = make_workspace(scale, spec)
+    # Fresh model registry per workspace, so the train stage really trains
+    env = dict(os.environ, CYBERRISK_MODEL_REGISTRY=os.path.join(workspace, "model_registry"), MPLBACKEND="Agg")
+    try:
+        result = {"inputs": spec, "stages": bench_stages(workspace, env)}
+        if pages:
+            result["pages"] = bench_pages(workspace, env)
+        return result
+    finally:
+        if keep:
+            print(f"   📁 workspace kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+# === History and baseline
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def flatten(run):
+    """{"10x/stages/merge/seconds": 1.2, ...} for every measured metric of a run."""
+    metrics = {}
+    for scale, groups in run["scales"].items():
+        for group, items in groups.items():
+            if group == "inputs":
+                continue
+            for item, values in items.items():
+                for metric, value in values.items():
+                    if metric in THRESHOLDS and value is not None:
+                        metrics[f"{scale_label(scale)}/{group}/{item}/{metric}"] = value
+    return metrics
+
+
+def compare(run, baseline):
+    """Metrics that grew past their threshold: [(key, baseline, current, ratio)].
+
+    Only scales generated from the same inputs as in the baseline are compared.
+    """
+    current, reference = flatten(run), flatten(baseline)
+    same_inputs = {scale_label(scale) for scale, groups in run["scales"].items()
+                   if baseline["scales"].get(scale, {}).get("inputs") == groups.get("inputs")}
+    regressions = []
+    for key, value in current.items():
+        if key not in reference or key.split("/", 1)[0] not in same_inputs:
+            continue
+        metric = key.rsplit("/", 1)[1]
+        base = reference[key]
+        if value - base > NOISE_FLOOR[metric] and value > base * (1 + THRESHOLDS[metric]):
+            regressions.append((key, base, value, value / base if base else float("inf")))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages and dashboard pages.")
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES,
+                        help="synthetic scale factors: N× the regions and N× the incidents per year (e.g. 1 10 100)")
+    parser.add_argument("--no-bundled", action="store_true", help="skip the run on the bundled inputs")
+    parser.add_argument("--years", type=int, nargs=2, default=YEARS, metavar=("FIRST", "LAST"),
+                        help="years of the synthetic inputs")
+    parser.add_argument("--incidents", type=int, default=INCIDENTS_PER_YEAR,
+                        help="mean incidents per year at 1× (scaled with the regions)")
+    parser.add_argument("--no-pages", action="store_true", help="skip the dashboard page renders")
+    parser.add_argument("--history", default=os.path.join(ROOT, HISTORY_FILE))
+    parser.add_argument("--baseline", default=os.path.join(ROOT, BASELINE_FILE))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch workspaces")
+    args = parser.parse_args(argv)
+
+    run = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scales": {},
+    }
+    if not args.no_bundled:
+        print("📏 Bundled inputs")
+        run["scales"][BUNDLED] = bench_scale(BUNDLED, bundled_spec(), pages=not args.no_pages, keep=args.keep)
+    for scale in args.scales:
+        print(f"📏 Scale {scale}× (synthetic)")
+        spec = input_spec(scale, args.years, args.incidents)
+        run["scales"][str(scale)] = bench_scale(scale, spec, pages=not args.no_pages, keep=args.keep)
+
+    history = load_json(args.history, [])
+    history.append(run)
+    save_json(args.history, history)
+    print(f"✅ Appended run to {args.history} ({len(history)} runs)")
+
+    if args.save_baseline:
+        save_json(args.baseline, run)
+        print(f"📌 Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print("ℹ️ No baseline yet — rerun with --save-baseline to create one")
+        return 0
+    regressions = compare(run, baseline)
+    for key, base, value, ratio in regressions:
+        print(f"❌ {key}: {base:.2f} → {value:.2f} ({ratio:.2f}×)")
+    if regressions:
+        return 1
+    print(f"✅ No regressions against baseline {baseline.get('commit')} ({baseline['created_at']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
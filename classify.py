@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# === Shared binning / classification
+# Vectorized replacements for the row-wise gdp_tier / net_group /
+# classify_risk helpers. All stages and the dashboard use these so the
+# labels agree everywhere; thresholds are the module defaults unless passed.
+
+UNKNOWN = "Unknown"
+
+# GDP per capita (USD) lower bounds of each tier above "Low Income"
+GDP_TIER_BREAKS = [4000, 12000, 40000]
+GDP_TIER_LABELS = ["Low Income", "Lower-Middle Income", "Upper-Middle Income", "High Income"]
+
+# Internet penetration (%) lower bounds of each group above "Emerging"
+NET_GROUP_BREAKS = [30, 70]
+NET_GROUP_LABELS = ["Emerging", "Developing", "Advanced"]
+
+# Risk band around a zero prediction error:
+#   "std"      -> |error| > RISK_STD_WIDTH * std(|error|)   (same as |Z_Error| > 1)
+#   "absolute" -> |error| > RISK_ABSOLUTE_BAND attacks
+RISK_METHOD = "std"
+RISK_STD_WIDTH = 1.0
+RISK_ABSOLUTE_BAND = 50
+RISK_LABELS = ["Underpredicted", "Within Model Range", "Overpredicted", UNKNOWN]
+
+
+def bin_labels(values, breaks, labels):
+    """Label values by half-open [lower, upper) bins; missing values -> "Unknown"."""
+    edges = [-np.inf] + list(breaks) + [np.inf]
+    binned = pd.cut(values, bins=edges, labels=labels, right=False)
+    return binned.cat.add_categories(UNKNOWN).fillna(UNKNOWN)
+
+
+def gdp_tier(gdp_per_capita, breaks=GDP_TIER_BREAKS):
+    return bin_labels(gdp_per_capita, breaks, GDP_TIER_LABELS)
+
+
+def net_group(penetration, breaks=NET_GROUP_BREAKS):
+    return bin_labels(penetration, breaks, NET_GROUP_LABELS)
+
+
+def risk_band(errors, method=RISK_METHOD, width=None):
+    """Half-width of the "Within Model Range" band for the given errors."""
+    if method == "std":
+        return (RISK_STD_WIDTH if width is None else width) * errors.abs().std()
+    if method == "absolute":
+        return RISK_ABSOLUTE_BAND if width is None else width
+    raise ValueError(f"Unknown risk method: {method!r} (expected 'std' or 'absolute')")
+
+
+def classify_risk(errors, method=RISK_METHOD, width=None):
+    """Risk class per prediction error (actual - predicted)."""
+    band = risk_band(errors, method, width)
+    labels = np.select(
+        [errors.isna(), errors < -band, errors > band],
+        [UNKNOWN, "Underpredicted", "Overpredicted"],
+        default="Within Model Range",
+    )
+    return pd.Series(pd.Categorical(labels, categories=RISK_LABELS), index=errors.index)
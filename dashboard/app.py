@@ -1,5 +1,10 @@
+import os
+from datetime import datetime
+
 import streamlit as st
 
+from data import PREDICTIONS, dataset_path, get_predictions
+
 # Set page config
 st.set_page_config(
     page_title="Cyber Risk Intelligence Dashboard",
@@ -25,8 +30,14 @@ This interface integrates data engineering, enrichment, machine learning predict
 - 🔍 Log-Scaled Visuals
 - 📂 Raw Data Browser
 - 📈 2025–2030 Forecast
+- 🧪 What-If Scenarios
+- ⏱️ Pipeline Run History
+- 🧾 Data Profile
 """)
 
 # Optional: Add visual cue for data freshness
-st.info("🔄 All insights are based on the enriched dataset: `merged_fully_enriched.csv`")
+path = dataset_path(PREDICTIONS)
+updated = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M")
+rows = len(get_predictions(columns=["ISO3"]))
+st.info(f"🔄 All insights are based on the enriched dataset: `{os.path.basename(path)}` ({rows} rows, updated {updated})")
 
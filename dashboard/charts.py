@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+# === Scatter plots for large point clouds
+# scatter() takes px.scatter's arguments and keeps what reaches the browser
+# bounded. Rows that cannot be drawn (missing x/y, non-positive on a log
+# axis) are dropped first. Above MAX_POINTS the rest is decimated on the
+# server, density-preserving: the plot area is cut into grid cells in the
+# axes' own (linear or log) scale — GRID × GRID at most, coarser while the
+# occupied cells would take more than SPARSE_SHARE of the budget — and every
+# occupied cell keeps a share of its points proportional to its population,
+# but at least one: dense regions stay dense, isolated outliers are never
+# dropped. Each colour keeps its own share of a cell. Above WEBGL_THRESHOLD
+# points the traces render with WebGL (scattergl) instead of one SVG node
+# per point. If the figure's JSON still exceeds MAX_PAYLOAD_BYTES (long
+# hover texts), the point budget is cut in proportion and the figure
+# rebuilt, up to PAYLOAD_PASSES times.
+
+WEBGL_THRESHOLD = int(os.environ.get("CYBERRISK_WEBGL_THRESHOLD", "1000"))
+MAX_POINTS = int(os.environ.get("CYBERRISK_MAX_POINTS", "5000"))
+MAX_PAYLOAD_BYTES = int(os.environ.get("CYBERRISK_MAX_PAYLOAD_BYTES", str(1 << 20)))
+PAYLOAD_PASSES = 4
+GRID = 64
+SPARSE_SHARE = 0.2
+SEED = 0
+
+
+def drawable(df, x, y, log_x=False, log_y=False):
+    """Rows with a point on the plot: finite x/y, positive on log axes."""
+    keep = np.ones(len(df), dtype=bool)
+    for col, log in ((x, log_x), (y, log_y)):
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        keep &= np.isfinite(values) & ((values > 0) if log else True)
+    return keep
+
+
+def unit_positions(values, log=False):
+    """Values mapped to [0, 1] across their range, in the axis' scale."""
+    values = np.log10(values) if log else values
+    lo, hi = values.min(), values.max()
+    return (values - lo) / (hi - lo) if hi > lo else np.zeros(len(values))
+
+
+def decimate(df, x, y, target, color=None, log_x=False, log_y=False, grid=GRID, seed=SEED):
+    """At most about `target` rows of `df`, sampled per plot cell in proportion to its density.
+
+    Cells with fewer points than their share keep one and the denser cells
+    share what is left, so the result only exceeds `target` when more cells
+    are occupied than that. The sample is deterministic (same rows on every
+    rerun).
+    """
+    n = len(df)
+    if n <= target:
+        return df
+    u = unit_positions(df[x].to_numpy(dtype=np.float64), log_x)
+    v = unit_positions(df[y].to_numpy(dtype=np.float64), log_y)
+    codes, n_codes = np.zeros(n, dtype=np.int64), 1
+    if color is not None:
+        codes = df[color].astype("category").cat.codes.to_numpy(dtype=np.int64) + 1  # -1 (NaN) -> 0
+        n_codes = int(codes.max()) + 1
+
+    # Coarsen the grid until the occupied strata take at most SPARSE_SHARE of
+    # the budget; a finer grid would spend it on one point per sparse cell
+    while True:
+        col = np.minimum((u * grid).astype(np.int64), grid - 1)
+        row = np.minimum((v * grid).astype(np.int64), grid - 1)
+        stratum = (col * grid + row) * n_codes + codes
+        counts = np.bincount(stratum, minlength=grid * grid * n_codes)
+        if np.count_nonzero(counts) <= target * SPARSE_SHARE or grid <= 2:
+            break
+        grid //= 2
+
+    # Sparse strata keep one point each; the dense ones share the rest of the budget
+    sparse = (counts > 0) & (counts * target < n)
+    dense_rows = counts[~sparse].sum()
+    rest = max(target - int(sparse.sum()), 0)
+    quota = np.maximum(1, np.floor(counts * rest / max(dense_rows, 1))).astype(np.int64)
+    quota[sparse] = 1
+
+    # Random order within each stratum, then keep the first `quota` of them
+    order = np.argsort(stratum + np.random.default_rng(seed).random(n))
+    starts = np.cumsum(counts) - counts
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - starts[stratum[order]]
+    return df[rank < quota[stratum]]
+
+
+def scatter(df, x, y, color=None, log_x=False, log_y=False, max_points=MAX_POINTS,
+            max_bytes=MAX_PAYLOAD_BYTES, **kwargs):
+    """px.scatter with WebGL, server-side decimation and a payload cap (see above)."""
+    df = df[drawable(df, x, y, log_x, log_y)]
+    total = len(df)
+    target = max_points
+    for _ in range(PAYLOAD_PASSES):
+        points = decimate(df, x, y, target, color, log_x, log_y)
+        fig = px.scatter(points, x=x, y=y, color=color, log_x=log_x, log_y=log_y,
+                         render_mode="webgl" if len(points) > WEBGL_THRESHOLD else "svg", **kwargs)
+        size = len(fig.to_json())
+        if size <= max_bytes or len(points) <= 1:
+            break
+        target = max(1, int(min(target, len(points)) * max_bytes / size * 0.9))
+    if len(points) < total:
+        fig.add_annotation(text=f"Showing {len(points):,} of {total:,} points (density-preserving sample)",
+                           xref="paper", yref="paper", x=1, y=1.02, xanchor="right", yanchor="bottom",
+                           showarrow=False, font=dict(size=11, color="gray"))
+    return fig
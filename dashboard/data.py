@@ -0,0 +1,203 @@
+import importlib
+import json
+import os
+import sys
+import threading
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# The pipeline's shared modules live one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import TABLES, build_table, split_by_year, table_name  # noqa: E402
+from datastore import find_stage, load_frame  # noqa: E402
+from frame_index import FrameIndex  # noqa: E402
+from instrument import ROOT, RUN_LOG, read_run_log  # noqa: E402
+from profiler import REPORT_FILE as PROFILE_REPORT  # noqa: E402
+
+# === Shared dataset access for the dashboard
+# Every page gets its frames from here. Each dataset is loaded once per
+# process and the same object is shared read-only by all sessions
+# (st.cache_resource), instead of one copy per session and call. The cache
+# key carries the file's mtime, so a rebuilt dataset is picked up on the
+# next rerun. Pages must not modify the returned frames in place — derive
+# new columns with .assign() or on a filtered copy. The first page of a new
+# worker starts loading the other datasets in the background; serve.py
+# starts a fuller warm-up together with the server. Stored datasets are
+# looked up in the repo root (DATA_DIR), like the model registry and the run
+# log, whatever directory the app was started from.
+
+DATA_DIR = os.environ.get("CYBERRISK_DATA_DIR", ROOT)
+
+PREDICTIONS = "predictions_enriched"
+FORECAST = "future_predictions"
+
+WARM_UP = os.environ.get("CYBERRISK_WARM_UP", "1") == "1"
+# Only warmed at server start, where they do not compete with a page for the CPU
+WARM_LIBRARIES = ["plotly.express", "altair"]
+
+
+def stored(name):
+    """Store name of a dataset (see datastore.py), anchored to DATA_DIR."""
+    return os.path.join(DATA_DIR, name)
+
+
+@st.cache_resource(show_spinner="Loading dataset...", max_entries=8)
+def _load(name, path, mtime_ns):
+    return load_frame(stored(name), compact=True)
+
+
+def dataset_path(name):
+    return os.path.abspath(find_stage(stored(name)))
+
+
+def get_dataset(name, columns=None):
+    """Shared, read-only frame for a dataset, optionally restricted to some columns."""
+    path = dataset_path(name)
+    df = _load(name, path, os.stat(path).st_mtime_ns)
+    if columns is not None:
+        return df[list(columns)]
+    return df
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _index(name, path, mtime_ns):
+    return FrameIndex(_load(name, path, mtime_ns))
+
+
+def get_index(name):
+    """Filter index over the full dataset; valid for any column subset of it."""
+    path = dataset_path(name)
+    return _index(name, path, os.stat(path).st_mtime_ns)
+
+
+def get_predictions(columns=None):
+    return get_dataset(PREDICTIONS, columns)
+
+
+def get_forecast(columns=None):
+    return get_dataset(FORECAST, columns)
+
+
+# === Precomputed lookup tables (see aggregates.py / 6aggregates.py)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _aggregate(table, path, mtime_ns, materialized):
+    if materialized:
+        full = load_frame(stored(table_name(table)), compact=True)
+    else:
+        source, _ = TABLES[table]
+        full = build_table(table, get_dataset(source))
+    return full, split_by_year(full)
+
+
+def get_aggregate(table, year=None):
+    """Rows of a lookup table, for one year or all years.
+
+    Reads the materialized table when it is at least as new as its source
+    dataset, otherwise builds it from the source once per process.
+    """
+    source, _ = TABLES[table]
+    source_path = dataset_path(source)
+    try:
+        path = dataset_path(table_name(table))
+        materialized = os.path.getmtime(path) >= os.path.getmtime(source_path)
+    except FileNotFoundError:
+        materialized = False
+    if not materialized:
+        path = source_path
+
+    full, by_year = _aggregate(table, path, os.stat(path).st_mtime_ns, materialized)
+    if year is None:
+        return full
+    return by_year.get(year, full.iloc[0:0])
+
+
+# === Pipeline run log (see instrument.py)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _run_log(path, mtime_ns):
+    log = pd.DataFrame(read_run_log(path))
+    if log.empty:
+        return log, None, None, None
+    stages = log[log["step"].isna()]
+    runs = stages.groupby("run_id", sort=False).agg(
+        started=("at", "min"), seconds=("seconds", "sum"), peak_rss_mb=("peak_rss_mb", "max"),
+        stages=("stage", "count"), failed=("status", lambda s: int((s != "ok").sum())),
+    ).sort_values("started")
+    return log, stages, log[log["step"].notna()], runs
+
+
+def get_run_log():
+    """(log, stage rows, step rows, per-run summary) of the run log, or None if nothing is logged yet."""
+    if not os.path.exists(RUN_LOG):
+        return None
+    return _run_log(RUN_LOG, os.stat(RUN_LOG).st_mtime_ns)
+
+
+# === Dataset profile report (see profiler.py)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _profile_report(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_profile_report():
+    """The last profiler.py report, or None if the data files have not been profiled yet."""
+    if not os.path.exists(PROFILE_REPORT):
+        return None
+    return _profile_report(PROFILE_REPORT, os.stat(PROFILE_REPORT).st_mtime_ns)
+
+
+# === Background warm-up (once per process)
+
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+
+def _warm_up(full):
+    for name in (PREDICTIONS, FORECAST):
+        try:
+            get_index(name)  # loads the dataset as well
+        except FileNotFoundError:
+            pass  # the page that needs it reports the missing dataset
+    for table in TABLES:
+        try:
+            get_aggregate(table)
+        except FileNotFoundError:
+            pass
+    get_run_log()
+    if not full:
+        return
+    for module in WARM_LIBRARIES:
+        importlib.import_module(module)
+    # plotly loads its figure validators on the first figure, not on import
+    px = importlib.import_module("plotly.express")
+    px.bar(pd.DataFrame({"x": ["a"], "y": [1], "c": ["a"]}), x="x", y="y", color="c").to_json()
+    try:
+        from scoring import get_scorer  # sklearn + the registered model, for the What-If page
+        get_scorer()
+    except FileNotFoundError:
+        pass
+
+
+def warm_up(full=False):
+    """Load the shared datasets and lookup tables in a background thread, once per process.
+
+    `full` (server start, see serve.py) also imports the plotting libraries
+    and loads the registered model.
+    """
+    global _warm_thread
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(target=_warm_up, args=(full,), name="dashboard-warm-up", daemon=True)
+            _warm_thread.start()
+    return _warm_thread
+
+
+# Imported by a page (not by serve.py): warm up the rest while the page runs
+if WARM_UP and get_script_run_ctx(suppress_warning=True) is not None:
+    warm_up()
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from datastore import COMPRESSION
+
+# === Filtered-data export for the Data Browser
+# An export is only built when its download button is clicked (Streamlit
+# runs the deferred callable then, off the page script). It is written in
+# EXPORT_CHUNK_ROWS pieces to a file under EXPORT_DIR, so no full CSV string
+# of the selection is ever held in memory, and the file name is a hash of
+# the dataset version, the filters, the sort order and the format: the same
+# filter combination is served from the file again instead of re-exported.
+# Only the newest MAX_EXPORTS files are kept.
+
+EXPORT_DIR = os.environ.get("CYBERRISK_EXPORT_DIR", os.path.join(".cache", "exports"))
+EXPORT_CHUNK_ROWS = int(os.environ.get("CYBERRISK_EXPORT_CHUNK_ROWS", "50000"))
+MAX_EXPORTS = 32
+
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def export_path(fmt, spec):
+    """Cache file for one export; `spec` is everything the selection depends on."""
+    key = hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(EXPORT_DIR, f"{key}{FORMATS[fmt][1]}")
+
+
+def chunks(df, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(rows), chunk_rows):
+        yield df.iloc[rows[start:start + chunk_rows]]
+
+
+def write_csv(df, rows, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        df.iloc[0:0].to_csv(f, index=False)
+        for chunk in chunks(df, rows):
+            chunk.to_csv(f, index=False, header=False)
+
+
+def write_parquet(df, rows, path):
+    schema = pa.Schema.from_pandas(df.iloc[0:0], preserve_index=False)
+    with pq.ParquetWriter(path, schema, compression=COMPRESSION) as writer:
+        for chunk in chunks(df, rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def prune(keep=MAX_EXPORTS):
+    files = [os.path.join(EXPORT_DIR, name) for name in os.listdir(EXPORT_DIR)]
+    for path in sorted(files, key=os.path.getmtime, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # another worker got there first
+
+
+def export_file(df, rows, fmt, spec):
+    """Path of the export of `df.iloc[rows]`, written on the first request for `spec`."""
+    path = export_path(fmt, spec)
+    if not os.path.exists(path):
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        WRITERS[fmt](df, rows, tmp)
+        os.replace(tmp, path)
+        prune()
+    return path
+
+
+def deferred_export(df, rows, fmt, spec):
+    """Callable for st.download_button: builds (or reuses) the export when clicked."""
+    def build():
+        with open(export_file(df, rows, fmt, spec), "rb") as f:
+            return f.read()
+    return build
@@ -0,0 +1,87 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+# === Filter index for the dashboard frames
+# Built once per dataset load (see data.get_index). Year filters resolve to
+# precomputed row offsets, flag / tier filters compare small integer codes
+# on those rows only, and the ISO3 search matches against the distinct codes
+# instead of every row. Sorting ranks each column once; a filtered selection
+# is then ordered by its rows' ranks instead of re-sorting the frame.
+
+
+def category_codes(series):
+    cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    return np.asarray(cat.cat.codes), list(cat.cat.categories)
+
+
+class FrameIndex:
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.year_rows = {year: np.sort(rows) for year, rows in df.groupby("Year").indices.items()}
+
+        self.codes, self.categories = {}, {}
+        for col in ["Transparency_Flag", "GDP_Tier", "ISO3"]:
+            if col in df.columns:
+                self.codes[col], self.categories[col] = category_codes(df[col])
+
+        # ISO3 codes sorted by name, for prefix lookups with bisect
+        iso_categories = self.categories.get("ISO3", [])
+        self.iso3_sorted = sorted((str(c), i) for i, c in enumerate(iso_categories))
+        self.iso3_names = [name for name, _ in self.iso3_sorted]
+        self.ranks = {}
+
+    def years(self):
+        return sorted(self.year_rows)
+
+    def present(self, col):
+        """Categories of `col` that occur in the data, in the category (schema) order."""
+        counts = np.bincount(self.codes[col][self.codes[col] >= 0], minlength=len(self.categories[col]))
+        return [c for c, n in zip(self.categories[col], counts) if n]
+
+    def values_codes(self, col, values):
+        lookup = {v: i for i, v in enumerate(self.categories[col])}
+        return np.array([lookup[v] for v in values if v in lookup], dtype=np.int64)
+
+    def iso3_codes(self, query, prefix=False):
+        query = query.upper()
+        if prefix:
+            start = bisect.bisect_left(self.iso3_names, query)
+            stop = bisect.bisect_left(self.iso3_names, query + "\uffff")
+            return np.array([i for _, i in self.iso3_sorted[start:stop]], dtype=np.int64)
+        return np.array([i for name, i in self.iso3_sorted if query in name], dtype=np.int64)
+
+    def rows(self, year=None, flag=None, tiers=None, iso3=None, iso3_prefix=False):
+        """Sorted row positions matching all the given filters (None = no filter)."""
+        if year is not None:
+            rows = self.year_rows.get(year, np.empty(0, dtype=np.int64))
+        else:
+            rows = np.arange(self.n_rows)
+
+        if flag is not None:
+            rows = rows[np.isin(self.codes["Transparency_Flag"][rows], self.values_codes("Transparency_Flag", [flag]))]
+        if tiers is not None:
+            rows = rows[np.isin(self.codes["GDP_Tier"][rows], self.values_codes("GDP_Tier", tiers))]
+        if iso3:
+            rows = rows[np.isin(self.codes["ISO3"][rows], self.iso3_codes(iso3, prefix=iso3_prefix))]
+        return rows
+
+    def rank(self, df, column, ascending=True):
+        """Position of every row in the frame sorted by `column` (NaN last), computed once."""
+        key = (column, ascending)
+        if key not in self.ranks:
+            order = df[column].reset_index(drop=True).sort_values(
+                ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self.ranks[key] = rank
+        return self.ranks[key]
+
+    def sort_rows(self, df, rows, column, ascending=True):
+        """`rows` (positions in the indexed frame `df`) ordered by one of its columns."""
+        return rows[np.argsort(self.rank(df, column, ascending)[rows], kind="stable")]
+
+    def select(self, df, **filters):
+        """Rows of `df` (the indexed frame or a column subset of it) matching the filters."""
+        return df.iloc[self.rows(**filters)]
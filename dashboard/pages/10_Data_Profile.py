@@ -0,0 +1,88 @@
+import pandas as pd
+import streamlit as st
+
+from data import get_profile_report
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+st.set_page_config(layout="wide")
+st.title("🧾 Data Profile")
+st.markdown("Rows, missing values and year coverage of every data file, from the last `profiler.py` report.")
+
+# === Load the report (shared, read-only)
+report = get_profile_report()
+if report is None or not report["files"]:
+    st.info("No profile yet — run `python profiler.py` (add `--mode meta` for a metadata-only pass).")
+    st.stop()
+
+files = pd.DataFrame(report["files"])
+for col in ["rows", "n_columns", "rows_estimated", "non_null", "error"]:
+    if col not in files.columns:
+        files[col] = None
+files["non_null_share"] = [
+    sum(nn.values()) / (rows * len(nn)) if isinstance(nn, dict) and nn and rows else None
+    for nn, rows in zip(files["non_null"], files["rows"])
+]
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Files", len(files))
+col2.metric("Rows", f"{files['rows'].fillna(0).sum():,.0f}")
+col3.metric("Mode", report["mode"], help=f"Profiled {report['created_at']}")
+col4.metric("Wall time", f"{report['wall_seconds']:.2f}s",
+            help=f"{(files['cache'] == 'hit').sum()} of {len(files)} profiles from cache")
+
+# === File overview
+st.markdown("### 📂 Files")
+st.dataframe(
+    files[["path", "format", "rows", "rows_estimated", "n_columns", "non_null_share", "bytes", "seconds", "cache", "error"]]
+    .rename(columns={"rows_estimated": "estimated", "n_columns": "columns", "non_null_share": "non-null share"}),
+    use_container_width=True,
+    hide_index=True,
+)
+if report.get("skipped_exports"):
+    st.caption(f"Skipped CSV exports of stored stage outputs: {', '.join(report['skipped_exports'])}")
+
+# === One file in detail
+profiled = files[files["non_null"].notna()]
+if profiled.empty:
+    st.info("This report has no column-level detail — profile with `--mode sample` or `--mode full`.")
+    st.stop()
+
+path = st.selectbox("File", list(profiled["path"]))
+profile = profiled[profiled["path"] == path].iloc[0]
+step = profile.get("sample_step")
+if pd.notna(step):
+    st.caption(f"Sampled 1 row in {int(step)} ({int(profile['sampled_rows']):,} of ~{int(profile['rows']):,}): "
+               "non-null counts and rows by year are scaled estimates; distinct countries by year "
+               "are counted in the sample only.")
+
+st.markdown("### 🧼 Non-null values per column")
+non_null = pd.Series(profile["non_null"], name="non_null").rename_axis("column").reset_index()
+non_null["share"] = non_null["non_null"] / profile["rows"] if profile["rows"] else None
+fig1 = px.bar(non_null.sort_values("share"), x="share", y="column", orientation="h", range_x=[0, 1],
+              hover_data=["non_null"])
+fig1.update_layout(template="plotly_white", height=max(300, 22 * len(non_null)), xaxis_tickformat=".0%")
+st.plotly_chart(fig1, use_container_width=True)
+
+if isinstance(profile.get("non_null_per_row"), dict):
+    per_row = pd.Series(profile["non_null_per_row"]).rename_axis("non-null fields").reset_index(name="rows")
+    st.markdown("**Rows by number of non-null fields**")
+    st.bar_chart(per_row, x="non-null fields", y="rows")
+
+if isinstance(profile.get("null_share_by_year"), dict):
+    st.markdown(f"### 📅 Missing values by year (`{profile['year_column']}`)")
+    matrix = pd.DataFrame(profile["null_share_by_year"]).T
+    matrix = matrix[sorted(matrix.columns, key=int)]
+    fig2 = px.imshow(matrix, color_continuous_scale="Reds", zmin=0, zmax=1, aspect="auto",
+                     labels={"x": "Year", "y": "Column", "color": "Null share"})
+    fig2.update_layout(height=max(300, 22 * len(matrix)))
+    st.plotly_chart(fig2, use_container_width=True)
+
+    coverage = pd.DataFrame({"rows": pd.Series(profile["rows_by_year"])})
+    if isinstance(profile.get("countries_by_year"), dict):
+        coverage[f"distinct {profile['country_column']}"] = pd.Series(profile["countries_by_year"])
+    coverage = coverage.rename_axis("Year").reset_index()
+    coverage["Year"] = coverage["Year"].astype(int)
+    st.markdown("**Coverage by year**")
+    st.line_chart(coverage.sort_values("Year"), x="Year")
@@ -1,23 +1,22 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-# Load dataset
-df = pd.read_csv("predictions_enriched.csv")
+from charts import scatter
+from data import get_predictions
+from classify import classify_risk
+from startup import lazy_import
 
-st.title("📊 Risk Discrepancy")
-st.markdown("Analyze where the model's predictions diverge from actual recorded cyber attacks.")
+px = lazy_import("plotly.express")
 
-# Calculate standard deviation of absolute error
-error_std = df["Abs_Error"].std()
+# Load dataset (shared, read-only)
+df = get_predictions(columns=[
+    "ISO3", "Year", "GDP_Tier", "Attack_Count", "Predicted_Attack_Count", "Prediction_Error", "Abs_Error"
+])
 
-# Define risk classification based on standard deviation
-def classify_risk(row):
-    if row["Abs_Error"] > error_std:
-        return "Underpredicted" if row["Prediction_Error"] < 0 else "Overpredicted"
-    return "Within Model Range"
+st.title("📊 Risk Discrepancy")
+st.markdown("Analyze where the model's predictions diverge from actual recorded cyber attacks.")
 
-df["Risk_Class"] = df.apply(classify_risk, axis=1)
+# Risk classification: error beyond one standard deviation of the absolute error
+df = df.assign(Risk_Class=classify_risk(df["Prediction_Error"], method="std"))
 
 # Sidebar filters
 with st.sidebar:
@@ -49,7 +48,8 @@ st.plotly_chart(fig1, use_container_width=True)
 st.markdown("### 🎯 Actual vs Predicted Attack Count")
 
 if filtered_df["Attack_Count"].nunique() > 1 and filtered_df["Predicted_Attack_Count"].nunique() > 1:
-    fig2 = px.scatter(
+    # WebGL and a density-preserving sample above a point threshold (charts.py)
+    fig2 = scatter(
         filtered_df,
         x="Attack_Count",
         y="Predicted_Attack_Count",
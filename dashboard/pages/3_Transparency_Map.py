@@ -1,25 +1,20 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 
-st.set_page_config(layout="wide")
-st.title("🕵️ Transparency Heatmap – Reporting Honesty Index")
+from data import get_predictions
+from startup import lazy_import
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv("predictions_enriched.csv").copy()
+px = lazy_import("plotly.express")
 
-    required = ["Attack_Count", "Predicted_Attack_Count", "ISO3", "Year"]
-    if not all(col in df.columns for col in required):
-        st.error("Missing required columns in the dataset.")
-        st.stop()
-
-    # Compute Reporting Honesty Index: log10((Attack+1)/(Predicted+1))
-    df["Honesty_Index"] = np.log10((df["Attack_Count"] + 1) / (df["Predicted_Attack_Count"] + 1))
-    return df
+st.set_page_config(layout="wide")
+st.title("🕵️ Transparency Heatmap – Reporting Honesty Index")
 
-df = load_data()
+required = ["Attack_Count", "Predicted_Attack_Count", "ISO3", "Year"]
+try:
+    df = get_predictions(columns=required)
+except KeyError:
+    st.error("Missing required columns in the dataset.")
+    st.stop()
 
 # Sidebar – year selector
 st.sidebar.header("📅 Filter")
@@ -32,6 +27,9 @@ if filtered.empty:
     st.warning("No data available for this year.")
     st.stop()
 
+# Compute Reporting Honesty Index: log10((Attack+1)/(Predicted+1))
+filtered["Honesty_Index"] = np.log10((filtered["Attack_Count"] + 1) / (filtered["Predicted_Attack_Count"] + 1))
+
 # Color range based on symmetric max
 min_val = filtered["Honesty_Index"].min()
 max_val = filtered["Honesty_Index"].max()
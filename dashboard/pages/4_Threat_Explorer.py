@@ -1,14 +1,17 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
 import numpy as np
 
+from data import get_predictions
+from startup import lazy_import
+
+alt = lazy_import("altair")
+
 st.set_page_config(layout="wide")
 st.title("🔥 Threat Index Explorer")
 
-@st.cache_data
 def load_data():
-    df = pd.read_csv("predictions_enriched.csv")
+    df = get_predictions()
     # 1) Exclude rows where:
     #   - Attack_Count = 0
     #   - Adjusted_Threat_Index = 0
@@ -17,7 +20,7 @@ def load_data():
         (df["Attack_Count"] > 0) &
         (df["Adjusted_Threat_Index"] > 0) &
         (df["Growth_Adjusted_Risk"] >= 0)
-    ].copy()
+    ]
     return df
 
 df = load_data()
@@ -1,19 +1,21 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+
+from data import PREDICTIONS, get_aggregate, get_index, get_predictions
+from startup import lazy_import
+
+alt = lazy_import("altair")
 
 st.set_page_config(layout="wide")
 st.title("📑 Prediction Log & Anomaly Insights")
 
-# === Load dataset
-@st.cache_data
-def load_data():
-    return pd.read_csv("predictions_enriched.csv")
-
-df = load_data()
+# === Load dataset (shared, read-only)
+df = get_predictions(columns=[
+    "ISO3", "Year", "Attack_Count", "Predicted_Attack_Count", "Prediction_Error", "Transparency_Flag"
+])
+index = get_index(PREDICTIONS)
 
 # === Sidebar filters
-years = sorted(df["Year"].dropna().unique())
+years = index.years()
 selected_year = st.sidebar.selectbox("Year", years, index=len(years)-1)
 
 flag_types = ["All", "Suspicious Underreporting", "Normal"]
@@ -21,14 +23,14 @@ selected_flag = st.sidebar.selectbox("Transparency Flag", flag_types)
 
 search_iso = st.sidebar.text_input("Search Country ISO3")
 
-# === Filter
-filtered_df = df[df["Year"] == selected_year]
-
-if selected_flag != "All":
-    filtered_df = filtered_df[filtered_df["Transparency_Flag"] == selected_flag]
-
-if search_iso:
-    filtered_df = filtered_df[filtered_df["ISO3"].str.contains(search_iso.upper())]
+# === Filter (the unfiltered top 10 lists are precomputed)
+unfiltered = selected_flag == "All" and not search_iso
+filtered_df = index.select(
+    df,
+    year=selected_year,
+    flag=None if selected_flag == "All" else selected_flag,
+    iso3=search_iso,
+)
 
 if filtered_df.empty:
     st.warning("No data found for the selected filters.")
@@ -36,7 +38,10 @@ if filtered_df.empty:
 
 # === Top 10 Underreported (high error)
 st.markdown("### ⚠️ Top 10 Underpredicted Cases")
-under_df = filtered_df.sort_values("Prediction_Error").head(10)
+if unfiltered:
+    under_df = get_aggregate("top_underpredicted", selected_year)
+else:
+    under_df = filtered_df.sort_values("Prediction_Error").head(10)
 st.dataframe(under_df[["ISO3", "Year", "Attack_Count", "Predicted_Attack_Count", "Prediction_Error", "Transparency_Flag"]])
 
 under_chart = alt.Chart(under_df).mark_bar().encode(
@@ -50,7 +55,10 @@ st.altair_chart(under_chart, use_container_width=True)
 
 # === Top 10 Overpredicted (opposite direction)
 st.markdown("### ⚡ Top 10 Overpredicted Cases")
-over_df = filtered_df.sort_values("Prediction_Error", ascending=False).head(10)
+if unfiltered:
+    over_df = get_aggregate("top_overpredicted", selected_year)
+else:
+    over_df = filtered_df.sort_values("Prediction_Error", ascending=False).head(10)
 st.dataframe(over_df[["ISO3", "Year", "Attack_Count", "Predicted_Attack_Count", "Prediction_Error", "Transparency_Flag"]])
 
 over_chart = alt.Chart(over_df).mark_bar().encode(
@@ -1,23 +1,24 @@
+import os
+
 import streamlit as st
-import pandas as pd
+
+from data import PREDICTIONS, dataset_path, get_index, get_predictions
+from export import FORMATS, deferred_export
 
 st.set_page_config(layout="wide")
 st.title("🔎 Full Data Browser")
 
-# === Load dataset
-@st.cache_data
-def load_data():
-    return pd.read_csv("predictions_enriched.csv")
-
-df = load_data()
+# === Load dataset (shared, read-only)
+df = get_predictions()
+index = get_index(PREDICTIONS)
 
 # === Sidebar filters
 st.sidebar.header("📋 Filters")
 
-years = sorted(df["Year"].dropna().unique())
+years = index.years()
 selected_year = st.sidebar.selectbox("Year", years, index=len(years)-1)
 
-gdp_tiers = sorted(df["GDP_Tier"].dropna().unique())
+gdp_tiers = index.present("GDP_Tier")
 selected_gdp = st.sidebar.multiselect("GDP Tier", gdp_tiers, default=gdp_tiers)
 
 flags = ["All", "Suspicious Underreporting", "Normal"]
@@ -25,31 +26,49 @@ selected_flag = st.sidebar.selectbox("Transparency Flag", flags)
 
 search_iso = st.sidebar.text_input("Search ISO3")
 
-# === Filter data
-filtered_df = df[df["Year"] == selected_year]
-if selected_flag != "All":
-    filtered_df = filtered_df[filtered_df["Transparency_Flag"] == selected_flag]
+# === Filter data (through the prebuilt index, no full-frame masks)
+filters = dict(
+    year=selected_year,
+    flag=None if selected_flag == "All" else selected_flag,
+    tiers=selected_gdp or None,
+    iso3=search_iso,
+)
+rows = index.rows(**filters)
 
-if selected_gdp:
-    filtered_df = filtered_df[filtered_df["GDP_Tier"].isin(selected_gdp)]
+# === Show filtered table, one page at a time
+# Sorting and paging happen here on the server: only the visible page is
+# sent to the browser (the table's own column sort orders that page only).
+st.markdown("### 📄 Filtered Dataset")
 
-if search_iso:
-    filtered_df = filtered_df[filtered_df["ISO3"].str.contains(search_iso.upper())]
+col1, col2, col3 = st.columns([2, 1, 1])
+sort_column = col1.selectbox("Sort by", list(df.columns), index=list(df.columns).index("Prediction_Error"))
+ascending = col2.radio("Order", ["Descending", "Ascending"], horizontal=True) == "Ascending"
+page_size = col3.selectbox("Rows per page", [25, 50, 100, 250, 500], index=2)
 
-# === Show filtered table
-st.markdown("### 📄 Filtered Dataset")
+n_pages = max(1, -(-len(rows) // page_size))
+if st.session_state.get("browser_page", 1) > n_pages:
+    st.session_state["browser_page"] = 1  # the filters shrank the selection
+page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key="browser_page")
 
-st.dataframe(
-    filtered_df.sort_values("Prediction_Error", ascending=False),
-    use_container_width=True
-)
+rows = index.sort_rows(df, rows, sort_column, ascending)
+start = (page - 1) * page_size
+window = rows[start:start + page_size]
+st.dataframe(df.iloc[window], use_container_width=True)
+st.caption(f"Rows {start + 1 if len(window) else 0:,}–{start + len(window):,} of {len(rows):,}")
 
 # === Optional: Export download
-with st.expander("⬇️ Export Filtered Data as CSV"):
-    st.download_button(
-        "Download CSV",
-        filtered_df.to_csv(index=False).encode("utf-8"),
-        file_name=f"filtered_data_{selected_year}.csv",
-        mime="text/csv"
-    )
+# Built only when a download button is clicked, in chunks, and cached per
+# filter combination (see export.py)
+with st.expander("⬇️ Export Filtered Data"):
+    path = dataset_path(PREDICTIONS)
+    spec = dict(filters, dataset=path, mtime_ns=os.stat(path).st_mtime_ns,
+                sort=sort_column, ascending=ascending)
+    for fmt, (mime, extension) in FORMATS.items():
+        st.download_button(
+            f"Download {fmt.upper()}",
+            deferred_export(df, rows, fmt, dict(spec, format=fmt)),
+            file_name=f"filtered_data_{selected_year}{extension}",
+            mime=mime,
+            key=f"export_{fmt}"
+        )
 
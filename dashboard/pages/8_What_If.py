@@ -0,0 +1,58 @@
+import streamlit as st
+
+from data import get_forecast
+from modeling import FEATURES
+from scoring import get_scorer
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+st.set_page_config(layout="wide")
+st.title("🧪 What-If Scenarios")
+st.markdown("Adjust the model inputs and re-score every country on the fly with the registered model.")
+
+# === Model (loaded once per process)
+try:
+    scorer = get_scorer()
+except FileNotFoundError:
+    st.error("No trained model found — run `python pipeline.py train` first.")
+    st.stop()
+
+# === Baseline: projected features for the chosen forecast year
+df = get_forecast(columns=["ISO3", "Year"] + FEATURES)
+years = sorted(df["Year"].unique())
+selected_year = st.sidebar.selectbox("Forecast year", years, index=0)
+base = df[df["Year"] == selected_year].drop_duplicates(subset="ISO3").reset_index(drop=True)
+
+# === Scenario sliders (% change per feature)
+st.sidebar.header("🎚️ Scenario (% change)")
+changes = {
+    feat: st.sidebar.slider(feat, min_value=-50, max_value=100, value=0, step=5, key=f"whatif_{feat}")
+    for feat in FEATURES
+}
+scenario = base.assign(**{feat: base[feat] * (1 + pct / 100) for feat, pct in changes.items() if pct})
+
+# === Score baseline and scenario in one batch each
+baseline_pred = scorer.score(base)
+scenario_pred = scorer.score(scenario)
+
+result = base[["ISO3"]].assign(
+    Baseline=baseline_pred,
+    Scenario=scenario_pred,
+    Change=scenario_pred - baseline_pred,
+)
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Baseline total", f"{result['Baseline'].sum():,.0f}")
+col2.metric("Scenario total", f"{result['Scenario'].sum():,.0f}", delta=f"{result['Change'].sum():+,.0f}")
+col3.metric("Model", f"{scorer.version}", help=f"Cache hits/misses: {scorer.hits}/{scorer.misses}")
+
+# === Biggest movers
+st.markdown(f"### 📊 Largest changes in predicted attacks ({selected_year})")
+movers = result.reindex(result["Change"].abs().sort_values(ascending=False).index).head(10)
+fig = px.bar(movers, x="ISO3", y="Change", color="Change", color_continuous_scale="RdBu_r")
+fig.update_layout(template="plotly_white")
+st.plotly_chart(fig, use_container_width=True)
+
+with st.expander("📋 Scenario results"):
+    st.dataframe(result.sort_values("Scenario", ascending=False), use_container_width=True)
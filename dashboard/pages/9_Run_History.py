@@ -0,0 +1,78 @@
+import streamlit as st
+
+from data import get_run_log
+from startup import lazy_import
+
+px = lazy_import("plotly.express")
+
+# The charts over runs show the newest ones only, so the page stays fast as the log grows
+MAX_RUNS = 50
+
+st.set_page_config(layout="wide")
+st.title("⏱️ Pipeline Run History")
+st.markdown("Stage and step timings, row counts and peak memory of every logged `pipeline.py` run.")
+
+# === Load the run log and its per-run summary (shared, read-only, warmed with the datasets)
+run_log = get_run_log()
+if run_log is None or run_log[0].empty:
+    st.info("No runs logged yet — run `python pipeline.py` to record one.")
+    st.stop()
+log, stages, steps, runs = run_log
+shown = list(runs.index[-MAX_RUNS:])
+recent = stages[stages["run_id"].isin(shown)]
+
+# === Latest run
+latest = runs.index[-1]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Runs logged", len(runs))
+col2.metric("Latest run (stage seconds)", f"{runs.loc[latest, 'seconds']:.1f}s")
+col3.metric("Peak RSS", f"{runs.loc[latest, 'peak_rss_mb']:.0f} MB")
+col4.metric("Failed stages", int(runs.loc[latest, "failed"]))
+
+if len(runs) > MAX_RUNS:
+    st.caption(f"Charts show the latest {MAX_RUNS} of {len(runs)} runs.")
+
+# Only the open tab runs
+tab1, tab2, tab3 = st.tabs(["📈 Stage durations", "🧠 Peak memory", "🔍 Run details"],
+                           key="run_history_tab", on_change="rerun")
+
+# --- Tab 1: stacked stage durations per run
+with tab1:
+    if tab1.open:
+        fig1 = px.bar(recent, x="run_id", y="seconds", color="stage", category_orders={"run_id": shown},
+                      hover_data=["rows_in", "rows_out", "status"])
+        fig1.update_layout(template="plotly_white", xaxis_title="Run", yaxis_title="Seconds")
+        st.plotly_chart(fig1, use_container_width=True)
+
+        # Latest run against the median of the earlier ones
+        previous = stages[stages["run_id"] != latest].groupby("stage")["seconds"].median()
+        current = stages[stages["run_id"] == latest].set_index("stage")["seconds"]
+        if not previous.empty:
+            change = (current / previous.reindex(current.index) - 1) * 100
+            st.markdown("**Latest run vs. median of earlier runs**")
+            st.dataframe(
+                current.to_frame("Latest (s)").assign(**{"Median (s)": previous, "Change (%)": change.round(1)}),
+                use_container_width=True,
+            )
+
+# --- Tab 2: peak RSS per stage over runs
+with tab2:
+    if tab2.open:
+        fig2 = px.line(recent, x="run_id", y="peak_rss_mb", color="stage", markers=True,
+                       category_orders={"run_id": shown})
+        fig2.update_layout(template="plotly_white", xaxis_title="Run", yaxis_title="Peak RSS (MB)")
+        st.plotly_chart(fig2, use_container_width=True)
+
+# --- Tab 3: step breakdown of one run
+with tab3:
+    if tab3.open:
+        run_id = st.selectbox("Run", list(runs.index[::-1]), index=0)
+        run_steps = steps[steps["run_id"] == run_id]
+        fig3 = px.bar(run_steps, x="seconds", y="step", color="stage", orientation="h",
+                      hover_data=["rows_in", "rows_out", "cache", "peak_rss_mb"])
+        fig3.update_layout(template="plotly_white", yaxis={"categoryorder": "total ascending"}, height=600)
+        st.plotly_chart(fig3, use_container_width=True)
+        st.dataframe(
+            run_steps[["stage", "step", "seconds", "rows_in", "rows_out", "cache", "peak_rss_mb", "status"]],
+            use_container_width=True,
+        )
@@ -0,0 +1,21 @@
+import os
+import sys
+
+from streamlit.web import cli
+
+import data
+
+# === Dashboard server with warm-up at start
+# `python dashboard/serve.py [streamlit options]` is `streamlit run app.py`
+# with the full background warm-up (data.warm_up) started together with the
+# server, before the first session connects: datasets, lookup tables,
+# plotting libraries and the model. The pages import this same `data`
+# module, so they share its caches.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+    if data.WARM_UP:
+        data.warm_up(full=True)
+    sys.argv = ["streamlit", "run", os.path.join(HERE, "app.py")] + sys.argv[1:]
+    sys.exit(cli.main())
@@ -0,0 +1,125 @@
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+# === Dashboard startup budget
+# A fresh worker has to serve its first page well under a second. Pages get
+# their plotting libraries through lazy_import(), so plotly.express and
+# altair are only imported when a chart is actually built (and tabs only
+# run when opened), and serve.py warms datasets, libraries and the model in
+# a background thread as the server starts. `python dashboard/startup.py`
+# renders every page once in a fresh interpreter after that warm-up, as a
+# new worker would, from the repo root like serve.py and benchmark.py, and
+# reports each page's first-run time and the imports it triggered against
+# the budget.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+STARTUP_BUDGET_MS = float(os.environ.get("CYBERRISK_STARTUP_BUDGET_MS", "750"))
+TOP_IMPORTS = 5
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self.__name = name
+
+    def __getattr__(self, attr):
+        # import_module is thread-safe and returns the cached module after the first call
+        return getattr(importlib.import_module(self.__name), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self.__name!r}>"
+
+
+def lazy_import(name):
+    """`px = lazy_import("plotly.express")` instead of `import plotly.express as px`."""
+    return LazyModule(name)
+
+
+# === Import-time report
+
+MARKER = "-- first page --"
+
+# Child process: server-start warm-up, then the first run of one page
+FIRST_PAGE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, sys.argv[3])
+if sys.argv[2] == "1":
+    import data
+    data.warm_up(full=True).join()
+sys.stderr.write("%s\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "exceptions": len(at.exception)}))
+""" % MARKER
+
+
+def parse_importtime(stderr):
+    """Top-level imports (cumulative ms) logged by -X importtime after the marker."""
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    imports = {}
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit() or name[1:2] == " ":  # header or nested import
+            continue
+        imports[name.strip()] = int(cumulative) / 1000
+    return imports
+
+
+def measure_page(page, warm=True):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", FIRST_PAGE, os.path.join(HERE, page), "1" if warm else "0", HERE],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed:\n{result.stderr[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(result.stderr)
+    report.update(page=page, import_ms=round(sum(imports.values()), 1), ms=round(report["ms"], 1),
+                  imports=dict(sorted(imports.items(), key=lambda kv: -kv[1])[:TOP_IMPORTS]))
+    return report
+
+
+def pages():
+    names = sorted(os.listdir(os.path.join(HERE, "pages")))
+    return ["app.py"] + [os.path.join("pages", n) for n in names if n.endswith(".py")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="First-page time and imports of a fresh dashboard worker.")
+    parser.add_argument("pages", nargs="*", help="pages to measure (default: app.py and every page)")
+    parser.add_argument("--cold", action="store_true",
+                        help="no server-start warm-up (as with `streamlit run`)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="first-page budget in ms")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    reports = [measure_page(page, warm=not args.cold) for page in args.pages or pages()]
+    print(f"{'page':<32} {'first run':>10} {'imports':>9}  heaviest imports")
+    for r in reports:
+        mark = "✅" if r["ms"] <= args.budget and not r["exceptions"] else "⚠️"
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in r["imports"].items()) or "-"
+        print(f"{mark} {r['page']:<30} {r['ms']:>8.0f}ms {r['import_ms']:>7.0f}ms  {heaviest}")
+
+    over = [r["page"] for r in reports if r["ms"] > args.budget or r["exceptions"]]
+    print(f"\nBudget {args.budget:.0f} ms per first page: "
+          + (f"{len(over)} over ({', '.join(over)})" if over else "all pages within budget"))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget, "warm_up": not args.cold, "pages": reports}, f, indent=2)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
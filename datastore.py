@@ -0,0 +1,104 @@
+import json
+import os
+
+import pandas as pd
+
+from instrument import step
+from schema import apply_schema
+
+# === Stage output store
+# Each pipeline stage saves its frame as a typed, compressed columnar file
+# (Parquet by default, Arrow IPC optional) instead of a CSV. Readers can ask
+# for just the columns they need. CSV export is kept for tools that want it;
+# readers only fall back to it when no typed copy exists (find_stage).
+# Frames are cast to the column schema (schema.py) on save and on load; the
+# files keep float64 metrics, load_frame(compact=True) reads them as float32.
+# Small fitted parameters (e.g. normalization bounds) are kept as JSON.
+
+STORE_FORMAT = os.environ.get("CYBERRISK_STORE_FORMAT", "parquet")
+EXPORT_CSV = os.environ.get("CYBERRISK_EXPORT_CSV", "1") == "1"
+COMPRESSION = "zstd"
+
+EXTENSIONS = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "csv": ".csv",
+}
+
+
+def stage_path(name, fmt=STORE_FORMAT):
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown store format: {fmt!r} (expected one of {sorted(EXTENSIONS)})")
+    return f"{name}{EXTENSIONS[fmt]}"
+
+
+def save_frame(df, name, fmt=STORE_FORMAT, csv=EXPORT_CSV):
+    """Save a stage output as `<name>.<ext>`; returns the written path."""
+    path = stage_path(name, fmt)
+    with step(f"save {name}", rows_in=len(df), kind="save"):
+        out = apply_schema(df.reset_index(drop=True), compact=False)
+        if fmt == "parquet":
+            out.to_parquet(path, index=False, compression=COMPRESSION)
+        elif fmt == "arrow":
+            out.to_feather(path, compression=COMPRESSION)
+        else:
+            out.to_csv(path, index=False)
+
+        if csv and fmt != "csv":
+            out.to_csv(stage_path(name, "csv"), index=False)
+    return path
+
+
+def find_stage(name):
+    """Return the stored copy of a stage output to read.
+
+    STORE_FORMAT first, then the other typed format; the CSV export only
+    when there is no typed copy. File times play no part, so neither the
+    write order nor a touch or checkout changes which copy is read.
+    """
+    typed = [STORE_FORMAT] + [fmt for fmt in EXTENSIONS if fmt not in (STORE_FORMAT, "csv")]
+    candidates = [stage_path(name, fmt) for fmt in dict.fromkeys(typed + ["csv"])]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No stored output for stage {name!r} (looked for {', '.join(candidates)})")
+
+
+def load_frame(name, columns=None, compact=False):
+    """Load a stage output, optionally only the given columns.
+
+    Pipeline stages read the stored float64 metrics; `compact` (the
+    dashboard) casts them to float32.
+    """
+    path = find_stage(name)
+    columns = list(columns) if columns is not None else None
+
+    with step(f"load {name}", kind="load") as s:
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path, columns=columns)
+        elif path.endswith(".arrow"):
+            df = pd.read_feather(path, columns=columns)
+        else:
+            df = pd.read_csv(path, usecols=columns)
+            if columns is not None:
+                df = df[columns]
+        df = apply_schema(df, compact=compact)
+        s.rows_out = len(df)
+    return df
+
+
+def save_json(data, name):
+    """Save a small stage output as `<name>.json`; returns the written path."""
+    path = f"{name}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def load_json(name):
+    """A JSON stage output, or None if it has not been written yet."""
+    path = f"{name}.json"
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,170 @@
+import argparse
+import itertools
+import json
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import GroupKFold
+
+from modeling import FEATURES, TARGET, clean_features, make_estimator
+from panel import load_panel
+
+# === Model evaluation harness
+# Scores every configuration of a hyperparameter grid with time-aware and
+# country-grouped cross-validation. Configurations run in parallel on a
+# process pool. The cleaned feature matrix and target are gathered once
+# from the enriched dataset's panel cube (panel.py, written by 2enrich.py)
+# and saved as .npy files for the run; every worker memory-maps them
+# read-only instead of having them pickled to it or rebuilding them.
+
+REPORT_FILE = "evaluation_report.json"
+
+# Each entry expands to the cartesian product of its list values
+GRID = [
+    {"model": "random_forest", "n_estimators": [100, 200], "max_depth": [None, 12], "max_features": [1.0, "sqrt"]},
+    {"model": "hist_gradient_boosting", "max_iter": [200, 400], "max_depth": [None, 6], "learning_rate": [0.1, 0.05]},
+]
+
+
+def expand_grid(grid):
+    configs = []
+    for entry in grid:
+        keys = list(entry)
+        values = [v if isinstance(v, list) else [v] for v in entry.values()]
+        configs.extend(dict(zip(keys, combo)) for combo in itertools.product(*values))
+    return configs
+
+
+def rolling_origin_splits(years, min_train_years=3):
+    """Train on all years before each origin year, test on the origin year."""
+    distinct = np.unique(years)
+    return [
+        (f"year={origin}", np.flatnonzero(years < origin), np.flatnonzero(years == origin))
+        for origin in distinct[min_train_years:]
+    ]
+
+
+def grouped_splits(groups, n_splits=5):
+    """K folds with every country entirely in either train or test."""
+    folds = GroupKFold(n_splits=n_splits).split(np.zeros(len(groups)), groups=groups)
+    return [(f"fold={i}", train, test) for i, (train, test) in enumerate(folds)]
+
+
+def training_cells(panel):
+    """(country, year) positions of the country-years with a known target."""
+    return np.nonzero(panel.mask & ~np.isnan(panel.feature(TARGET)))
+
+
+def training_matrix(panel, cells):
+    """Cleaned X and y of the given cells, as modeling.training_rows builds them."""
+    rows = panel.values[cells]
+    X = clean_features(pd.DataFrame(rows[:, [panel.feature_pos[f] for f in FEATURES]], columns=FEATURES))
+    return X.to_numpy(dtype=np.float64), rows[:, panel.feature_pos[TARGET]].astype(np.float64)
+
+
+def save_matrix(X, y, directory):
+    """X and y as .npy files under `directory`; returns their paths."""
+    paths = os.path.join(directory, "X.npy"), os.path.join(directory, "y.npy")
+    for path, array in zip(paths, (X, y)):
+        np.save(path, array)
+    return paths
+
+
+def evaluate_config(config, scheme, splits, matrix_paths):
+    """Fit/score one configuration on every fold (runs inside a worker)."""
+    X, y = (np.load(path, mmap_mode="r") for path in matrix_paths)
+    start = time.perf_counter()
+    folds, fit_seconds, predict_seconds = [], 0.0, 0.0
+
+    for label, train, test in splits:
+        model = make_estimator(config)
+        t0 = time.perf_counter()
+        model.fit(X[train], y[train])
+        t1 = time.perf_counter()
+        pred = model.predict(X[test])
+        t2 = time.perf_counter()
+        fit_seconds += t1 - t0
+        predict_seconds += t2 - t1
+        folds.append({"fold": label, "n_train": len(train), "n_test": len(test),
+                      "mae": float(mean_absolute_error(y[test], pred))})
+
+    maes = np.array([f["mae"] for f in folds])
+    n_predicted = sum(f["n_test"] for f in folds)
+    return {
+        "config": config,
+        "scheme": scheme,
+        "folds": folds,
+        "mae_mean": float(maes.mean()),
+        "mae_std": float(maes.std()),
+        "fit_seconds": round(fit_seconds, 3),
+        "predict_ms_per_1k_rows": round(1000 * predict_seconds / max(n_predicted, 1) * 1000, 3),
+        "model_bytes": len(pickle.dumps(model)),  # last fold's model
+        "wall_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run(panel_name="merged_fully_enriched", grid=GRID, schemes=("rolling", "grouped"), workers=None,
+        min_train_years=3, n_splits=5):
+    panel = load_panel(panel_name)
+    cells = training_cells(panel)
+    years = panel.years[cells[1]]
+    groups = np.asarray(panel.iso3, dtype=object)[cells[0]]
+
+    split_sets = {}
+    if "rolling" in schemes:
+        split_sets["rolling"] = rolling_origin_splits(years, min_train_years)
+    if "grouped" in schemes:
+        split_sets["grouped"] = grouped_splits(groups, n_splits)
+
+    configs = expand_grid(grid)
+    with tempfile.TemporaryDirectory(prefix="cyberrisk-evaluate-") as directory:
+        matrix_paths = save_matrix(*training_matrix(panel, cells), directory)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(evaluate_config, config, scheme, splits, matrix_paths)
+                for scheme, splits in split_sets.items()
+                for config in configs
+            ]
+            return [f.result() for f in futures]
+
+
+def describe(config):
+    return " ".join(f"{k}={v}" for k, v in config.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validate the attack-count model grid.")
+    parser.add_argument("--schemes", nargs="+", default=["rolling", "grouped"], choices=["rolling", "grouped"])
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--min-train-years", type=int, default=3)
+    parser.add_argument("--folds", type=int, default=5, help="number of ISO3-grouped folds")
+    parser.add_argument("--output", default=REPORT_FILE)
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Evaluating {len(expand_grid(GRID))} configurations × {len(args.schemes)} split schemes...")
+    start = time.perf_counter()
+    results = run(schemes=args.schemes, workers=args.workers,
+                  min_train_years=args.min_train_years, n_splits=args.folds)
+
+    for scheme in args.schemes:
+        print(f"\n📊 {scheme} (sorted by mean MAE)")
+        for r in sorted((r for r in results if r["scheme"] == scheme), key=lambda r: r["mae_mean"]):
+            print(f"   MAE {r['mae_mean']:7.2f} ± {r['mae_std']:6.2f}  fit {r['fit_seconds']:6.2f}s  "
+                  f"predict {r['predict_ms_per_1k_rows']:7.2f}ms/1k  {r['model_bytes'] / 1e6:6.2f}MB  "
+                  f"{describe(r['config'])}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "wall_seconds": round(time.perf_counter() - start, 3),
+                   "results": results}, f, indent=2)
+    print(f"\n✅ Saved evaluation report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
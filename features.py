@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# === Derived feature registry
+# Every derived column is declared once: its name, the columns it depends
+# on and a NumPy formula over those columns. compute() resolves the
+# requested features and their dependencies, loads the raw inputs into one
+# contiguous float block and evaluates each feature exactly once, in
+# dependency order. Columns already present in the frame are reused rather
+# than recomputed, so a stage only pays for the features it asks for.
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    deps: tuple
+    formula: object
+
+
+def log10_positive(x):
+    # log10 with 0 (and negatives) -> NaN
+    return np.log10(np.where(x > 0, x, np.nan))
+
+
+def fill(x, value):
+    return np.where(np.isnan(x), value, x)
+
+
+REGISTRY = {f.name: f for f in [
+    Feature("Penetration_Index", ("Attack_Count", "GDP_per_capita_USD", "Internet_Penetration"),
+            lambda ac, gdp, pen: ac / (fill(gdp, 1) * ((fill(pen, 50) / 100) + 0.01))),
+
+    # Economic / digital exposure
+    Feature("Economic_Exposure", ("GDP_USD", "Population"),
+            lambda gdp, pop: gdp / pop),
+    Feature("Log_Economic_Exposure", ("Economic_Exposure",), log10_positive),
+    Feature("Digital_Exposure_Index", ("Internet_Penetration", "Cellular Subscription", "Broadband Subscription"),
+            lambda pen, cell, bb: pen * cell * bb),
+    Feature("Digital_Exposure_Index_B", ("Digital_Exposure_Index",),
+            lambda dei: dei / 1e9),
+    Feature("Connectivity_Score", ("Broadband Subscription", "Cellular Subscription", "Internet_Penetration"),
+            lambda bb, cell, pen: (bb + cell + pen) / 3),
+
+    # Threat indicators
+    Feature("Attack_Density", ("Attack_Count", "Population"),
+            lambda ac, pop: (ac / pop) * 1_000_000),
+    Feature("Growth_Adjusted_Risk", ("Attack_Density", "Population Growth"),
+            lambda density, growth: density * growth),
+    Feature("Adjusted_Threat_Index", ("Attack_Density", "Internet_Penetration"),
+            lambda density, pen: density * (pen / 100)),
+
+    # Log scales
+    Feature("Log_Population", ("Population",), log10_positive),
+    Feature("Log_Attack_Count", ("Attack_Count",), log10_positive),
+    Feature("Log_GDP_USD", ("GDP_USD",), log10_positive),
+    Feature("Log_Internet_Users", ("No. of Internet Users",), log10_positive),
+]}
+
+
+def plan(names, available=()):
+    """Features to evaluate (in dependency order) and the raw columns they read."""
+    order, raw, seen = [], [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in available or name not in REGISTRY:
+            raw.append(name)
+            return
+        for dep in REGISTRY[name].deps:
+            visit(dep)
+        order.append(name)
+
+    for name in names:
+        if name not in REGISTRY and name not in available:
+            raise KeyError(f"Unknown feature {name!r} and no such input column")
+        visit(name)
+    return order, raw
+
+
+def compute(df, names, reuse=True):
+    """Evaluate the named features; returns {name: ndarray} for the requested names."""
+    available = set(df.columns) if reuse else set(df.columns) - set(REGISTRY)
+    order, raw = plan(names, available)
+
+    block = np.asfortranarray(df[raw].to_numpy(dtype=np.float64))
+    values = {col: block[:, i] for i, col in enumerate(raw)}
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for name in order:
+            feature = REGISTRY[name]
+            values[name] = feature.formula(*(values[dep] for dep in feature.deps))
+    return {name: values[name] for name in names}
+
+
+def add_features(df, names, reuse=True):
+    """Frame with the named features added (or overwritten when reuse=False)."""
+    return df.assign(**compute(df, names, reuse=reuse))
+
+
+def nan_to_zero_block(df, columns):
+    return np.nan_to_num(df[columns].to_numpy(dtype=np.float64), nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+
+def min_max_bounds(df, columns):
+    """Per-column (min, max) as min_max_scale sees them (NaN -> 0)."""
+    block = nan_to_zero_block(df, columns)
+    return {col: (float(lo), float(hi)) for col, lo, hi in zip(columns, block.min(axis=0), block.max(axis=0))}
+
+
+def min_max_scale(df, columns, bounds=None):
+    """MinMaxScaler-equivalent [0, 1] scaling of several columns in one pass (NaN -> 0 first).
+
+    `bounds` ({column: (min, max)}, see min_max_bounds) scales with given
+    bounds instead of the columns' own, e.g. a subset of rows.
+    """
+    block = nan_to_zero_block(df, columns)
+    if bounds is None:
+        lo, hi = block.min(axis=0), block.max(axis=0)
+    else:
+        lo, hi = np.array([bounds[col] for col in columns], dtype=np.float64).reshape(-1, 2).T
+    span = hi - lo
+    scale = 1.0 / np.where(span == 0, 1.0, span)
+    scaled = block * scale - lo * scale
+    return {f"{col}_Norm": scaled[:, i] for i, col in enumerate(columns)}
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import find_stage, load_frame
+from features import min_max_bounds, min_max_scale
+from instrument import step
+from schema import apply_schema
+
+# === Append mode for row-wise stages
+# `pipeline.py --append` runs a stage with CYBERRISK_APPEND=1 when only its
+# data inputs changed since its last run (same code, same model). Such a
+# stage loads its previous output, hashes the input columns it reads per
+# (ISO3, Year) and computes its own columns only for keys that are new or
+# whose inputs changed; every other row carries its values over from the
+# previous output. Keys that disappeared from the input are dropped. Without
+# the flag, or without a previous output, every row is computed as usual.
+
+APPEND = os.environ.get("CYBERRISK_APPEND") == "1"
+KEYS = ["ISO3", "Year"]
+
+
+def key_index(df, keys=KEYS):
+    """(ISO3, Year) index of a frame, independent of the key columns' dtypes."""
+    return pd.MultiIndex.from_arrays([df[keys[0]].astype(str), df[keys[1]].astype("int64")], names=keys)
+
+
+def row_hashes(df, columns, keys=KEYS):
+    # Hash the stored dtypes, so a freshly computed frame matches its saved copy
+    hashes = pd.util.hash_pandas_object(apply_schema(df[columns], compact=False), index=False).to_numpy()
+    return pd.Series(hashes, index=key_index(df, keys))
+
+
+def previous_output(name):
+    """The stored output of a stage in append mode, else None."""
+    if not APPEND:
+        return None
+    try:
+        find_stage(name)
+    except FileNotFoundError:
+        return None
+    return load_frame(name)
+
+
+def rows_to_compute(df, name, columns, keys=KEYS):
+    """Rows of `df` to compute and the previous output `name` to carry the rest from.
+
+    Returns (changed, previous): a boolean mask over the rows of `df` and the
+    previous output, or all rows and None outside append mode.
+    """
+    previous = previous_output(name)
+    if previous is None or not set(columns) <= set(previous.columns):
+        return np.ones(len(df), dtype=bool), None
+
+    with step(f"diff {name}", rows_in=len(df)) as s:
+        current = row_hashes(df, columns, keys)
+        before = row_hashes(previous, columns, keys)
+        before = before[~before.index.duplicated()]
+        changed = ~current.index.isin(before.index)
+        changed |= current.to_numpy() != before.reindex(current.index, fill_value=0).to_numpy()
+        s.rows_out = int(changed.sum())
+    print(f"🔁 Append mode: {changed.sum()} of {len(df)} rows new or changed since the last {name}")
+    return changed, previous
+
+
+def carry_over(df, previous, part, columns, keys=KEYS):
+    """`df` with `columns` from `part` (the computed rows) and from `previous` for all other rows."""
+    if previous is None:
+        return part
+    index = key_index(df, keys)
+    fresh = part[columns].set_axis(key_index(part, keys))
+    kept = previous[columns].set_axis(key_index(previous, keys))
+    kept = kept[~kept.index.isin(fresh.index) & ~kept.index.duplicated()]
+    values = pd.concat([kept.astype(fresh.dtypes.to_dict()), fresh]).reindex(index).set_axis(df.index)
+    return df.assign(**{col: values[col] for col in columns})
+
+
+def rescale(df, previous, changed, columns, bounds=None, keys=KEYS):
+    """`df` with min-max scaled `<column>_Norm` columns; returns (df, bounds, moved).
+
+    Without a previous output and its bounds every row is scaled. Otherwise
+    each column's bounds are updated from the changed rows alone (a rescan
+    only when a row that left held the old min or max). Columns whose bounds
+    moved are rescaled in full; the rest only scale the changed rows.
+    """
+    if previous is None or bounds is None or not set(columns) <= set(bounds):
+        bounds = min_max_bounds(df, columns)
+        return df.assign(**min_max_scale(df, columns, bounds)), bounds, list(columns)
+
+    # Previous rows whose values are replaced or gone
+    leaving = ~key_index(previous, keys).isin(key_index(df[~changed], keys))
+    incoming = df[changed]
+    updated, moved = {}, []
+    for col in columns:
+        lo, hi = bounds[col]
+        old = np.nan_to_num(previous.loc[leaving, col].to_numpy(dtype=np.float64), nan=0.0)
+        if np.isin([lo, hi], old).any():
+            lo, hi = min_max_bounds(df, [col])[col]
+        elif len(incoming):
+            new_lo, new_hi = min_max_bounds(incoming, [col])[col]
+            lo, hi = min(lo, new_lo), max(hi, new_hi)
+        updated[col] = (lo, hi)
+        if updated[col] != tuple(bounds[col]):
+            moved.append(col)
+
+    kept = [col for col in columns if col not in moved]
+    if kept:
+        part = incoming.assign(**min_max_scale(incoming, kept, updated))
+        df = carry_over(df, previous, part, [f"{col}_Norm" for col in kept], keys)
+    if moved:
+        df = df.assign(**min_max_scale(df, moved, updated))
+    norm = [f"{col}_Norm" for col in columns]
+    return df[[col for col in df.columns if col not in norm] + norm], updated, moved
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+
+import openpyxl
+import pandas as pd
+
+from instrument import step
+
+# === Cached Excel ingest
+# Workbooks are streamed through openpyxl's read-only parser, keeping only
+# the requested columns, and converted once into a Parquet cache. The cache
+# entry records the workbook's mtime, size and SHA-256: an unchanged mtime
+# is trusted as is, a changed mtime falls back to the hash so a plain
+# `touch` does not trigger a re-parse.
+
+CACHE_DIR = os.environ.get("CYBERRISK_CACHE_DIR", os.path.join(".cache", "ingest"))
+
+UMD_WORKBOOK = "cyberattacks/UMD Cyber Attacks Dataset.xlsx"
+HHS_BREACHES_WORKBOOK = "cyberattacks/USDHH Data Breaches.xlsx"
+US_STATES_WORKBOOK = "cyberattacks/US State Names.xlsx"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(path, sheet, columns):
+    spec = json.dumps({"sheet": sheet, "columns": columns})
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    return f"{stem}-{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:12]}"
+
+
+def column_positions(ws, header, columns=None):
+    """Wanted column names and their positions in a worksheet header row."""
+    header = [str(h) if h is not None else None for h in header]
+    wanted = columns or [h for h in header if h is not None]
+    missing = [c for c in wanted if c not in header]
+    if missing:
+        raise ValueError(f"{ws.title!r} has no column(s) {missing}; available: {[h for h in header if h]}")
+    return wanted, [header.index(c) for c in wanted]
+
+
+def stream_sheet(ws, columns=None):
+    """Read one worksheet row by row, keeping only the wanted columns."""
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame(columns=columns or [])
+    wanted, positions = column_positions(ws, header, columns)
+
+    data = {c: [] for c in wanted}
+    for row in rows:
+        if row is None or all(v is None for v in row):
+            continue
+        for col, pos in zip(wanted, positions):
+            data[col].append(row[pos] if pos < len(row) else None)
+    return pd.DataFrame(data, columns=wanted)
+
+
+def parse_workbook(path, sheet=0, columns=None):
+    """Stream a workbook into a frame; sheet=None stacks every sheet."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            frames = []
+            for ws in wb.worksheets:
+                part = stream_sheet(ws, columns)
+                part["Sheet"] = ws.title
+                frames.append(part)
+            return pd.concat(frames, ignore_index=True)
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        return stream_sheet(ws, columns)
+    finally:
+        wb.close()
+
+
+def iter_workbook_chunks(path, columns=None, sheet=0, chunk_rows=50_000):
+    """Stream one worksheet as frames of at most `chunk_rows` rows (bypasses the cache)."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        wanted, positions = column_positions(ws, header, columns)
+
+        buffer = []
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            buffer.append([row[pos] if pos < len(row) else None for pos in positions])
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame(buffer, columns=wanted)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=wanted)
+    finally:
+        wb.close()
+
+
+def arrow_safe(df):
+    # Excel columns often mix numbers and text; store those as text
+    for col in df.columns:
+        if df[col].dtype == object:
+            kinds = {type(v) for v in df[col].dropna()}
+            if len(kinds) > 1:
+                df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+    return df
+
+
+def read_workbook(path, columns=None, sheet=0):
+    """Load the given columns of a workbook, serving repeat reads from the cache.
+
+    ``df.attrs["ingest_cache"]`` is set to ``"hit"`` or ``"miss"``.
+    """
+    with step(f"read {os.path.basename(path)}", kind="load") as s:
+        df = _read_workbook(path, columns, sheet)
+        s.rows_out, s.cache = len(df), df.attrs["ingest_cache"]
+    return df
+
+
+def _read_workbook(path, columns, sheet):
+    columns = list(columns) if columns is not None else None
+    key = cache_key(path, sheet, columns)
+    data_path = os.path.join(CACHE_DIR, f"{key}.parquet")
+    meta_path = os.path.join(CACHE_DIR, f"{key}.json")
+    stat = os.stat(path)
+
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(data_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+    if meta is not None:
+        fresh = meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size
+        if not fresh and meta["sha256"] == file_sha256(path):
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+            fresh = True
+        if fresh:
+            df = pd.read_parquet(data_path)
+            df.attrs["ingest_cache"] = "hit"
+            return df
+
+    df = arrow_safe(parse_workbook(path, sheet=sheet, columns=columns))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df.to_parquet(data_path, index=False, compression="zstd")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": path,
+            "sheet": sheet,
+            "columns": columns,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": file_sha256(path),
+        }, f, indent=2)
+    df.attrs["ingest_cache"] = "miss"
+    return df
+
+
+# === Known workbooks
+
+def load_umd_incidents(columns=("country", "year")):
+    return read_workbook(UMD_WORKBOOK, columns=columns)
+
+
+def load_hhs_breaches(columns=None):
+    # The workbook splits breaches over two sheets (older / newer than 24 months)
+    return read_workbook(HHS_BREACHES_WORKBOOK, columns=columns, sheet=None)
+
+
+def load_us_states():
+    return read_workbook(US_STATES_WORKBOOK, columns=["State", "State_Name"])
@@ -0,0 +1,132 @@
+import atexit
+import cProfile
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+# === Stage instrumentation
+# Pipeline stages (run by pipeline.py, which sets CYBERRISK_STAGE and one
+# CYBERRISK_RUN_ID per invocation) append one JSON line per sub-step to the
+# run log: duration, rows in/out, the process's peak RSS so far and, where
+# a cache is involved, hit or miss. When the stage's process exits, a
+# summary line for the whole stage follows. Outside a stage (e.g. in the
+# dashboard) step() only times and nothing is written. Stages listed in
+# CYBERRISK_PROFILE ("all" for every stage) also run under cProfile; the
+# .prof files land in PROFILE_DIR.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RUN_LOG = os.environ.get("CYBERRISK_RUN_LOG", os.path.join(ROOT, "run_log.jsonl"))
+PROFILE_DIR = os.environ.get("CYBERRISK_PROFILE_DIR", os.path.join(ROOT, ".profiles"))
+
+STAGE = os.environ.get("CYBERRISK_STAGE")
+RUN_ID = os.environ.get("CYBERRISK_RUN_ID") or uuid.uuid4().hex[:12]
+PROFILE = [s for s in os.environ.get("CYBERRISK_PROFILE", "").split(",") if s]
+
+# Wall-clock start of the stage process (pipeline.py passes its launch time)
+_started = float(os.environ.get("CYBERRISK_STAGE_STARTED") or time.time())
+_totals = {"rows_in": 0, "rows_out": 0, "cache_hits": 0, "cache_misses": 0}
+_failed = False
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process, in MB (None if unknown)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # kB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def write_record(record):
+    if STAGE is None or not RUN_LOG:
+        return
+    record = dict(run_id=RUN_ID, stage=STAGE, at=time.strftime("%Y-%m-%dT%H:%M:%S"), **record)
+    with open(RUN_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+class Step:
+    def __init__(self, name, rows_in=None, kind=None):
+        self.name = name
+        self.kind = kind  # "load" / "save" steps make up the stage's rows in / out
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.cache = None  # "hit" / "miss"
+
+
+@contextmanager
+def step(name, rows_in=None, kind=None):
+    """Time a sub-step; set .rows_out / .cache on the yielded Step to log them too."""
+    record = Step(name, rows_in, kind)
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield record
+        status = "ok"
+    finally:
+        if kind == "load":
+            _totals["rows_in"] += record.rows_out or 0
+        elif kind == "save":
+            _totals["rows_out"] += record.rows_in or 0
+        if record.cache == "hit":
+            _totals["cache_hits"] += 1
+        elif record.cache == "miss":
+            _totals["cache_misses"] += 1
+        write_record({
+            "step": name,
+            "seconds": round(time.perf_counter() - start, 4),
+            "rows_in": record.rows_in,
+            "rows_out": record.rows_out,
+            "peak_rss_mb": peak_rss_mb(),
+            "cache": record.cache,
+            "status": status,
+        })
+
+
+def _excepthook(kind, value, tb):
+    global _failed
+    _failed = True
+    _previous_excepthook(kind, value, tb)
+
+
+def _finish(profiler=None):
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"{RUN_ID}-{STAGE}.prof"))
+    write_record({
+        "step": None,
+        "seconds": round(time.time() - _started, 4),
+        **_totals,
+        "peak_rss_mb": peak_rss_mb(),
+        "status": "error" if _failed else "ok",
+    })
+
+
+if STAGE is not None:
+    _previous_excepthook = sys.excepthook
+    sys.excepthook = _excepthook
+    _profiler = None
+    if STAGE in PROFILE or "all" in PROFILE:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(_finish, _profiler)
+
+
+def read_run_log(path=RUN_LOG):
+    """All records of the run log as a list of dicts (oldest first)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
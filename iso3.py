@@ -0,0 +1,54 @@
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+import pycountry
+
+# === Country name -> ISO3
+# Names are resolved once per distinct value and applied with a vectorized
+# map. Spellings pycountry does not know (ISO short names with qualifiers,
+# "Turkey", ...) come from a persisted alias table; an alias of null marks a
+# value that is known not to be a country, such as "Undetermined".
+
+ALIASES_FILE = os.environ.get(
+    "CYBERRISK_ISO3_ALIASES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "iso3_aliases.json"),
+)
+
+
+@lru_cache(maxsize=1)
+def load_aliases(path=ALIASES_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=4096)
+def lookup_iso3(name):
+    """ISO3 code for one country name, or None if it cannot be resolved."""
+    name = name.strip()
+    aliases = load_aliases()
+    if name in aliases:
+        return aliases[name]
+    try:
+        return pycountry.countries.lookup(name).alpha_3
+    except LookupError:
+        return None
+
+
+def resolve_iso3(names):
+    """Map a Series of country names to ISO3 codes.
+
+    Returns the ISO3 Series (None where unresolved) and a Series counting the
+    rows of each name that failed to resolve and is not a known alias.
+    """
+    uniques = pd.unique(names.dropna())
+    mapping = {name: lookup_iso3(str(name)) for name in uniques}
+    iso3 = names.map(mapping)
+
+    aliases = load_aliases()
+    failed = [n for n, code in mapping.items() if code is None and str(n).strip() not in aliases]
+    unresolved = names[names.isin(failed)].value_counts()
+    return iso3, unresolved
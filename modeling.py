@@ -0,0 +1,271 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import mean_absolute_error
+
+# === Attack-count model: training + local registry
+# The model is trained once (forests on all cores) and saved under model_registry/
+# together with its feature list, a fingerprint of the training data and
+# its test metrics. 3ml_predict_attacks.py and 5future_2025_2030.py load it
+# from there. When the only change in the data is one or more new years,
+# the previous forest is warm-started with extra trees instead of being
+# retrained from scratch. The estimator comes from a named backend (BACKENDS)
+# and every trained model is measured against the serving budget (BUDGET).
+# Feature importances are computed once at training time and stored in the
+# model's meta.json.
+
+REGISTRY_DIR = os.environ.get(
+    "CYBERRISK_MODEL_REGISTRY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_registry"),
+)
+MODEL_NAME = "attack_count"
+
+# SAFE input features (no Attack_Count derived fields)
+FEATURES = [
+    "GDP_per_capita_USD",
+    "GDP_USD",
+    "Internet_Penetration",
+    "Population",
+    "Population Growth",
+    "Growth Rate (%)",
+    "No. of Internet Users",
+    "Cellular Subscription",
+    "Broadband Subscription",
+    "Connectivity_Score",
+    "Digital_Exposure_Index",
+    "Economic_Exposure"
+]
+TARGET = "Attack_Count"
+
+TEST_SHARE = 4  # every 4th country-year (by key hash) is held out
+
+
+# Estimator families by config name; extra config keys are passed as parameters
+ESTIMATORS = {
+    "random_forest": RandomForestRegressor,
+    "hist_gradient_boosting": HistGradientBoostingRegressor,
+}
+
+
+# Model backends selectable by name (CYBERRISK_MODEL_BACKEND)
+BACKENDS = {
+    # the original unbounded 200-tree forest
+    "forest": {"model": "random_forest", "n_estimators": 200, "n_jobs": -1},
+    # depth-limited forest: a fraction of the size, similar accuracy
+    "compact_forest": {"model": "random_forest", "n_estimators": 100, "max_depth": 12,
+                       "max_features": "sqrt", "n_jobs": -1},
+    # histogram gradient boosting: sub-second training, sub-MB models
+    "hist_gbm": {"model": "hist_gradient_boosting", "max_iter": 200, "max_depth": 6, "learning_rate": 0.1},
+}
+MODEL_BACKEND = os.environ.get("CYBERRISK_MODEL_BACKEND", "hist_gbm")
+
+# Parameter grown (and by how much) when warm-starting on new years
+WARM_START = {
+    "random_forest": ("n_estimators", 50),
+    "hist_gradient_boosting": ("max_iter", 50),
+}
+
+# Serving budget checked after every training run
+BUDGET = {
+    "max_model_bytes": 2_000_000,
+    "max_predict_ms": 50.0,
+    "predict_batch_rows": 1000,
+}
+
+
+def make_estimator(config):
+    """Build an unfitted estimator from {"model": <family>, **params}."""
+    params = dict(config)
+    family = params.pop("model")
+    if family not in ESTIMATORS:
+        raise ValueError(f"Unknown model family: {family!r} (expected one of {sorted(ESTIMATORS)})")
+    return ESTIMATORS[family](random_state=42, **params)
+
+
+def clean_features(frame):
+    return frame.replace([np.inf, -np.inf], np.nan).fillna(0).clip(-1e9, 1e9)
+
+
+def training_rows(df):
+    """Rows with a known target, plus their cleaned X and y."""
+    df = df.dropna(subset=[TARGET])
+    return df, clean_features(df[FEATURES]), df[TARGET]
+
+
+def test_mask(df):
+    # Split by a hash of (ISO3, Year) so a country-year stays on the same side
+    # of the split when new years are appended
+    keys = pd.DataFrame({"ISO3": df["ISO3"].astype(str), "Year": df["Year"].astype(int)})
+    return (pd.util.hash_pandas_object(keys, index=False).to_numpy() % TEST_SHARE) == 0
+
+
+def frame_hash(*frames):
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def year_fingerprints(df, X, y):
+    years = df["Year"].astype(int).to_numpy()
+    return {str(year): frame_hash(X[years == year], y[years == year]) for year in np.unique(years)}
+
+
+# === Registry
+
+def model_dir(name=MODEL_NAME):
+    return os.path.join(REGISTRY_DIR, name)
+
+
+def latest_path(name=MODEL_NAME):
+    return os.path.join(model_dir(name), "latest.json")
+
+
+def latest_meta(name=MODEL_NAME):
+    path = latest_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        version = json.load(f)["version"]
+    with open(os.path.join(model_dir(name), version, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_model(model, meta, name=MODEL_NAME):
+    existing = [v for v in os.listdir(model_dir(name)) if v.startswith("v")] if os.path.isdir(model_dir(name)) else []
+    version = f"v{len(existing) + 1:04d}"
+    path = os.path.join(model_dir(name), version)
+    os.makedirs(path)
+
+    meta = dict(meta, name=name, version=version)
+    joblib.dump(model, os.path.join(path, "model.joblib"))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    with open(latest_path(name), "w", encoding="utf-8") as f:
+        json.dump({"version": version}, f)
+    return meta
+
+
+def load_model(name=MODEL_NAME, version=None):
+    """Fitted model and its metadata (latest version unless one is given)."""
+    if version is None:
+        meta = latest_meta(name)
+        if meta is None:
+            raise FileNotFoundError(f"No trained model {name!r} in {REGISTRY_DIR}/ — run 3train_model.py first")
+        version = meta["version"]
+    path = os.path.join(model_dir(name), version)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return joblib.load(os.path.join(path, "model.joblib")), meta
+
+
+# === Training
+
+def check_budget(model, X, budget=BUDGET, repeats=3):
+    """Model size and predict latency for one batch, compared with the budget."""
+    size = len(pickle.dumps(model))
+    batch = X.sample(n=budget["predict_batch_rows"], replace=True, random_state=0)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(batch)
+        timings.append((time.perf_counter() - start) * 1000)
+    latency = float(np.median(timings))
+    return {
+        "model_bytes": size,
+        "max_model_bytes": budget["max_model_bytes"],
+        "predict_ms": round(latency, 3),
+        "max_predict_ms": budget["max_predict_ms"],
+        "predict_batch_rows": budget["predict_batch_rows"],
+        "within_budget": size <= budget["max_model_bytes"] and latency <= budget["max_predict_ms"],
+    }
+
+
+def can_warm_start(previous, years, config):
+    """True if every year the previous model saw is unchanged and new years were added."""
+    if previous is None or previous["features"] != FEATURES or previous.get("config") != config:
+        return False
+    old = previous["year_fingerprints"]
+    return all(years.get(y) == h for y, h in old.items()) and bool(set(years) - set(old))
+
+
+def train(df, name=MODEL_NAME, backend=MODEL_BACKEND, force=False):
+    """Train (or reuse / warm-start) the model for `df`; returns (model, meta)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend!r} (expected one of {sorted(BACKENDS)})")
+    config = BACKENDS[backend]
+    df, X, y = training_rows(df)
+    fingerprint = frame_hash(X, y)
+    years = year_fingerprints(df, X, y)
+    previous = None if force else latest_meta(name)
+
+    if (previous is not None and previous["data_fingerprint"] == fingerprint
+            and previous["features"] == FEATURES and previous.get("config") == config):
+        model, meta = load_model(name, previous["version"])
+        return model, dict(meta, status="reused")
+
+    held_out = test_mask(df)
+    X_train, y_train = X[~held_out], y[~held_out]
+    start = time.perf_counter()
+
+    if can_warm_start(previous, years, config):
+        model, _ = load_model(name, previous["version"])
+        param, extra = WARM_START[config["model"]]
+        model.set_params(warm_start=True, **{param: model.get_params()[param] + extra})
+        model.fit(X_train, y_train)
+        status, parent = "warm-started", previous["version"]
+    else:
+        model = make_estimator(config)
+        model.fit(X_train, y_train)
+        status, parent = "trained", None
+    train_seconds = time.perf_counter() - start
+
+    meta = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "features": FEATURES,
+        "target": TARGET,
+        "backend": backend,
+        "config": config,
+        "params": {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, bool, type(None)))},
+        "data_fingerprint": fingerprint,
+        "year_fingerprints": years,
+        "n_train": int((~held_out).sum()),
+        "n_test": int(held_out.sum()),
+        "metrics": {"mae": float(mean_absolute_error(y[held_out], model.predict(X[held_out])))},
+        "train_seconds": round(train_seconds, 3),
+        "warm_started_from": parent,
+        "budget": check_budget(model, X),
+        "feature_importances": compute_importances(model, X, y),
+    }
+    meta = save_model(model, meta, name)
+    return model, dict(meta, status=status)
+
+
+def predict(model, frame):
+    return model.predict(clean_features(frame[FEATURES]))
+
+
+def compute_importances(model, X, y):
+    """Impurity importances for forests, permutation importances otherwise; {feature: importance}."""
+    if hasattr(model, "feature_importances_"):
+        values = model.feature_importances_
+    else:
+        values = permutation_importance(model, X, y, n_repeats=5, random_state=42).importances_mean
+    return {f: float(v) for f, v in zip(X.columns, values)}
+
+
+def feature_importances(model, meta, df):
+    """Importances stored with the model; computed from `df` only for models registered before they were."""
+    stored = meta.get("feature_importances")
+    if stored is None:
+        _, X, y = training_rows(df)
+        stored = compute_importances(model, X, y)
+    return pd.Series(stored).reindex(meta["features"])
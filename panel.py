@@ -0,0 +1,219 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import load_json, save_json
+from instrument import step
+from schema import WIDE_FLOAT
+
+# === Country × year panel cube
+# Everything downstream of the merge works on a panel of (ISO3, Year) ×
+# features. A Panel keeps it as one dense cube values[country, year, feature]
+# with integer axes — countries sorted by ISO3, years a contiguous range —
+# and a validity mask[country, year] marking the country-years that exist
+# (a missing feature of an existing country-year stays NaN). Values are
+# float64, as stored, so models and projections see full precision. A cell lookup
+# is two dict lookups and an array index; diff, lag and slope run along the
+# year axis for every country and feature at once.
+#
+# save_panel writes the cube as .npy files next to the stage outputs and
+# load_panel memory-maps them read-only, so all processes reading a panel
+# (the forecast stage, evaluation workers) share the OS page cache instead
+# of each holding a copy.
+
+def panel_paths(name):
+    """(values, mask) files of a stored panel; its axes are the JSON output `<name>.panel`."""
+    return f"{name}.panel.npy", f"{name}.panel_mask.npy"
+
+
+class Panel:
+    def __init__(self, iso3, years, features, values, mask):
+        self.iso3 = [str(c) for c in iso3]
+        self.years = np.asarray(years, dtype=np.int64)
+        self.features = list(features)
+        self.values = values
+        self.mask = mask
+        self.iso3_pos = {c: i for i, c in enumerate(self.iso3)}
+        self.feature_pos = {f: i for i, f in enumerate(self.features)}
+        self.first_year = int(self.years[0]) if len(self.years) else 0
+
+    @classmethod
+    def from_frame(cls, df, features=None, key="ISO3", time="Year"):
+        """Panel of a long frame; the first row of a duplicated (key, time) wins.
+
+        `features` defaults to every numeric column other than the keys.
+        """
+        if features is None:
+            features = [c for c in df.columns
+                        if c not in (key, time) and pd.api.types.is_numeric_dtype(df[c])]
+        df = df.dropna(subset=[key, time])
+        df = df[~df.duplicated([key, time])]
+
+        codes, iso3 = pd.factorize(df[key].astype(str), sort=True)
+        year = df[time].to_numpy(dtype=np.int64)
+        years = np.arange(year.min(), year.max() + 1) if len(year) else np.empty(0, dtype=np.int64)
+        rows = year - (years[0] if len(years) else 0)
+
+        values = np.full((len(iso3), len(years), len(features)), np.nan, dtype=WIDE_FLOAT)
+        mask = np.zeros((len(iso3), len(years)), dtype=bool)
+        values[codes, rows] = df[features].to_numpy(dtype=WIDE_FLOAT, na_value=np.nan)
+        mask[codes, rows] = True
+        return cls(iso3, years, features, values, mask)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    # === Lookups
+
+    def position(self, iso3, year):
+        """(country, year) position of a country-year; KeyError if outside the axes."""
+        y = int(year) - self.first_year
+        if not 0 <= y < len(self.years):
+            raise KeyError(year)
+        return self.iso3_pos[iso3], y
+
+    def cell(self, iso3, year, feature):
+        """One value; NaN for a country-year that does not exist."""
+        c, y = self.position(iso3, year)
+        return float(self.values[c, y, self.feature_pos[feature]])
+
+    def feature(self, feature):
+        """(countries, years) view of one feature."""
+        return self.values[:, :, self.feature_pos[feature]]
+
+    def series(self, iso3, feature):
+        """One country's values of a feature over the years."""
+        return pd.Series(self.values[self.iso3_pos[iso3], :, self.feature_pos[feature]],
+                         index=pd.Index(self.years, name="Year"), name=feature)
+
+    def year(self, year, features=None):
+        """Frame of the countries that exist in one year."""
+        y = int(year) - self.first_year
+        if not 0 <= y < len(self.years):
+            return self.to_frame(features).iloc[0:0]
+        features = self.features if features is None else list(features)
+        rows = np.flatnonzero(self.mask[:, y])
+        frame = pd.DataFrame(self.values[rows, y][:, [self.feature_pos[f] for f in features]], columns=features)
+        frame.insert(0, "Year", int(year))
+        frame.insert(0, "ISO3", np.asarray(self.iso3, dtype=object)[rows])
+        return frame
+
+    def to_frame(self, features=None):
+        """Long frame of every existing country-year, sorted by ISO3 and Year."""
+        features = self.features if features is None else list(features)
+        c, y = np.nonzero(self.mask)
+        frame = pd.DataFrame(self.values[c, y][:, [self.feature_pos[f] for f in features]], columns=features)
+        frame.insert(0, "Year", self.years[y])
+        frame.insert(0, "ISO3", np.asarray(self.iso3, dtype=object)[c])
+        return frame
+
+    # === Time-series operations along the year axis
+    # Each returns a Panel over the same axes, with NaN (and a False mask)
+    # wherever the years a cell is computed from do not exist.
+
+    def _derived(self, values, mask):
+        values = np.where(mask[:, :, None], values, np.nan).astype(self.values.dtype, copy=False)
+        return Panel(self.iso3, self.years, self.features, values, mask)
+
+    def lag(self, periods=1):
+        """Values `periods` years earlier (later for negative periods)."""
+        values = np.full(self.values.shape, np.nan, dtype=self.values.dtype)
+        mask = np.zeros(self.mask.shape, dtype=bool)
+        n = len(self.years)
+        if periods >= 0:
+            values[:, periods:] = self.values[:, :n - periods]
+            mask[:, periods:] = self.mask[:, :n - periods]
+        else:
+            values[:, :periods] = self.values[:, -periods:]
+            mask[:, :periods] = self.mask[:, -periods:]
+        return self._derived(values, mask)
+
+    def diff(self, periods=1):
+        """Change since `periods` years earlier."""
+        lagged = self.lag(periods)
+        return self._derived(self.values - lagged.values, self.mask & lagged.mask)
+
+    def slope(self, window=3):
+        """Least-squares slope per year over the trailing `window` years.
+
+        Missing years inside the window are skipped; a slope needs at least
+        two of them. The first `window - 1` years have no slope.
+        """
+        values = np.full(self.values.shape, np.nan)
+        mask = np.zeros(self.mask.shape, dtype=bool)
+        if window <= len(self.years):
+            windows = np.lib.stride_tricks.sliding_window_view(self.values, window, axis=1)  # (C, Y-w+1, F, w)
+            t = np.arange(window, dtype=np.float64)
+            valid = ~np.isnan(windows)
+            n = valid.sum(axis=-1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                t_mean = (valid * t).sum(axis=-1) / n
+                v_mean = np.where(valid, windows, 0).sum(axis=-1) / n
+                tc = np.where(valid, t - t_mean[..., None], 0.0)
+                vc = np.where(valid, windows - v_mean[..., None], 0.0)
+                slope = (tc * vc).sum(axis=-1) / (tc ** 2).sum(axis=-1)
+            values[:, window - 1:] = np.where(n >= 2, slope, np.nan)
+            mask[:, window - 1:] = np.lib.stride_tricks.sliding_window_view(self.mask, window, axis=1).sum(axis=-1) >= 2
+        return self._derived(values, mask)
+
+    # === Projection input (see projection.py)
+
+    def pack(self, features, start=None, where=None, min_points=2):
+        """Per-country history in the layout of projection.pack_history.
+
+        Takes the existing country-years from `start` on (and where the
+        boolean (countries, years) array `where` holds), moves each
+        country's observed years to the front and keeps the countries with
+        at least `min_points` of them. Returns (keys, times, values, lengths).
+        """
+        first = 0 if start is None else max(int(start) - self.first_year, 0)
+        valid = self.mask[:, first:]
+        if where is not None:
+            valid = valid & where[:, first:]
+        lengths = valid.sum(axis=1)
+        keep = lengths >= min_points
+        valid, lengths = valid[keep], lengths[keep]
+
+        order = np.argsort(~valid, axis=1, kind="stable")[:, :int(lengths.max()) if len(lengths) else 0]
+        padding = np.arange(order.shape[1])[None, :] >= lengths[:, None]
+        times = np.take_along_axis(np.broadcast_to(self.years[first:].astype(float), valid.shape), order, axis=1)
+        times[padding] = np.nan
+        cube = self.values[keep, first:][:, :, [self.feature_pos[f] for f in features]]
+        values = np.take_along_axis(cube.astype(float), order[:, :, None], axis=1)
+        values[padding] = np.nan
+        return pd.Index(np.asarray(self.iso3, dtype=object)[keep]), times, values, lengths
+
+
+# === Storage (memory-mapped .npy files)
+
+def save_panel(panel, name):
+    """Save a panel as `<name>.panel.npy` + mask + axes; returns the values path.
+
+    Files are written under temporary names and renamed into place, so a
+    process that has the previous panel mapped keeps reading it unchanged.
+    """
+    values_path, mask_path = panel_paths(name)
+    with step(f"save {name} panel", rows_in=int(panel.mask.sum()), kind="save"):
+        for path, array in ((mask_path, panel.mask), (values_path, panel.values)):
+            tmp = f"{path}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(array))
+            os.replace(tmp, path)
+        save_json({"iso3": panel.iso3, "years": panel.years.tolist(), "features": panel.features},
+                  f"{name}.panel")
+    return values_path
+
+
+def load_panel(name, mmap=True):
+    """A stored panel, memory-mapped read-only unless `mmap` is False."""
+    values_path, mask_path = panel_paths(name)
+    axes = load_json(f"{name}.panel")
+    if axes is None or not os.path.exists(values_path):
+        raise FileNotFoundError(f"No stored panel for {name!r} (looked for {values_path})")
+    mode = "r" if mmap else None
+    with step(f"load {name} panel", kind="load") as s:
+        panel = Panel(axes["iso3"], axes["years"], axes["features"],
+                      np.load(values_path, mmap_mode=mode), np.load(mask_path, mmap_mode=mode))
+        s.rows_out = int(panel.mask.sum())
+    return panel
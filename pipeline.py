@@ -0,0 +1,304 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+from aggregates import TABLES, table_name
+from datastore import stage_path
+from instrument import PROFILE_DIR
+from modeling import latest_path
+from panel import panel_paths
+from streaming import INCIDENT_SOURCES
+
+# === Incremental pipeline runner
+# The numbered scripts are modelled as a DAG of stages with declared inputs
+# and outputs. A stage is skipped when the content hash of its inputs (data
+# files, its own script and the shared modules it imports) matches the last
+# successful run and its outputs are still on disk. Stages whose
+# dependencies are satisfied run in parallel, each in its own process.
+# Every stage logs its steps to the run log under one run id (instrument.py);
+# --profile runs the given stages under cProfile or py-spy. With --append,
+# row-wise stages whose code and model are unchanged only recompute the
+# country-years whose inputs changed (incremental.py), and the model is kept.
+# A stage with `refit_on` keeps its last output in normal runs as well when
+# none of those inputs nor its code changed: the model is only retrained for
+# new incident counts, not for a GDP / internet / population refresh.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = ".pipeline_state.json"
+MODEL_POINTER = os.path.relpath(latest_path(), ROOT)
+
+UMD_WORKBOOK = "cyberattacks/UMD Cyber Attacks Dataset.xlsx"
+GDP_CSV = "gdp/world_country_gdp_usd.csv"
+INTERNET_CSV = "internetusers/Final.csv"
+POPULATION_CSV = "population/countries_population.csv"
+# Panel cube of the enriched dataset (panel.py): values, mask and axes
+PANEL_FILES = list(panel_paths("merged_fully_enriched")) + ["merged_fully_enriched.panel.json"]
+
+# Every stage reads and writes through the store, which casts to the schema
+STORE_MODULES = ["datastore.py", "schema.py", "classify.py", "instrument.py"]
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: list
+    outputs: list
+    modules: list = field(default_factory=lambda: ["datastore.py"])
+    # In --append runs: "rows" recomputes changed keys only, "keep" leaves the last output, "full" reruns
+    append: str = "full"
+    # Inputs (anywhere upstream) whose change requires a rerun; if only other data changed, the output is kept
+    refit_on: list = None
+
+    def fingerprint_paths(self):
+        return list(dict.fromkeys([self.script] + STORE_MODULES + self.modules + self.inputs))
+
+    def code_paths(self):
+        """Everything but the data inputs; the model counts as code (re-scoring needs the same one)."""
+        return [p for p in self.fingerprint_paths() if p not in self.inputs or p == MODEL_POINTER]
+
+    def refit_paths(self):
+        return self.code_paths() + self.refit_on if self.refit_on else None
+
+
+STAGES = [
+    Stage("incidents", "1incidents.py",
+          inputs=[UMD_WORKBOOK] + INCIDENT_SOURCES,
+          outputs=[stage_path("attack_counts")],
+          modules=["datastore.py", "ingest.py", "iso3.py", "iso3_aliases.json", "streaming.py"]),
+    Stage("merge", "1merge.py",
+          inputs=[stage_path("attack_counts"), GDP_CSV, INTERNET_CSV, POPULATION_CSV],
+          outputs=[stage_path("merged_df")],
+          modules=["datastore.py", "features.py", "streaming.py", "incremental.py"],
+          append="rows"),
+    Stage("enrich", "2enrich.py",
+          inputs=[stage_path("merged_df")],
+          outputs=[stage_path("merged_fully_enriched"), "normalization_bounds.json"] + PANEL_FILES,
+          modules=["datastore.py", "classify.py", "features.py", "incremental.py", "panel.py"],
+          append="rows"),
+    Stage("train", "3train_model.py",
+          inputs=[stage_path("merged_fully_enriched")],
+          outputs=[MODEL_POINTER],
+          modules=["datastore.py", "modeling.py"],
+          append="keep",
+          refit_on=[stage_path("attack_counts")]),
+    Stage("predict", "3ml_predict_attacks.py",
+          inputs=[stage_path("merged_fully_enriched"), MODEL_POINTER],
+          outputs=[stage_path("merged_with_predictions"), "feature_importance.png"],
+          modules=["datastore.py", "classify.py", "modeling.py", "incremental.py"],
+          append="rows"),
+    Stage("metrics", "4custommetrics.py",
+          inputs=[stage_path("merged_with_predictions")],
+          outputs=[stage_path("predictions_enriched")],
+          modules=["datastore.py", "classify.py", "incremental.py"],
+          append="rows"),
+    Stage("future", "5future_2025_2030.py",
+          inputs=PANEL_FILES + [MODEL_POINTER],
+          outputs=[stage_path("future_predictions")],
+          modules=["datastore.py", "modeling.py", "panel.py", "projection.py"]),
+    Stage("aggregates", "6aggregates.py",
+          inputs=[stage_path("predictions_enriched"), stage_path("future_predictions")],
+          outputs=[stage_path(table_name(t)) for t in TABLES],
+          modules=["datastore.py", "aggregates.py"]),
+]
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(stage, paths=None):
+    """Combined content hash of everything a stage reads (or of the given paths)."""
+    digest = hashlib.sha256()
+    for path in stage.fingerprint_paths() if paths is None else paths:
+        digest.update(path.encode("utf-8"))
+        digest.update(file_hash(os.path.join(ROOT, path)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def load_state():
+    path = os.path.join(ROOT, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(os.path.join(ROOT, STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def build_graph(stages):
+    """Map each stage name to the names of the stages producing its inputs."""
+    producers = {out: s.name for s in stages for out in s.outputs}
+    return {s.name: {producers[i] for i in s.inputs if i in producers} for s in stages}
+
+
+def select(stages, targets):
+    """Restrict the stage list to the targets and everything upstream of them."""
+    if not targets:
+        return stages
+    by_name = {s.name: s for s in stages}
+    unknown = [t for t in targets if t not in by_name]
+    if unknown:
+        raise SystemExit(f"❌ Unknown stage(s): {', '.join(unknown)} (known: {', '.join(by_name)})")
+
+    graph = build_graph(stages)
+    wanted, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(graph[name])
+    return [s for s in stages if s.name in wanted]
+
+
+def outputs_exist(stage):
+    return all(os.path.exists(os.path.join(ROOT, out)) for out in stage.outputs)
+
+
+def is_fresh(stage, state, current):
+    previous = state.get(stage.name)
+    if previous is None or current is None:
+        return False
+    return outputs_exist(stage) and previous.get("fingerprint") == current
+
+
+def can_keep(stage, state, refit):
+    """True if none of the stage's `refit_on` inputs nor its code changed since its last run."""
+    previous = state.get(stage.name)
+    if previous is None or refit is None:
+        return False
+    return outputs_exist(stage) and previous.get("refit") == refit
+
+
+def can_append(stage, state, code):
+    """True if only the stage's data changed since its last run, so it can recompute changed rows."""
+    previous = state.get(stage.name)
+    if stage.append != "rows" or previous is None or code is None:
+        return False
+    return outputs_exist(stage) and previous.get("code") == code
+
+
+def stage_command(stage, run_id, profile=(), profiler="cprofile", append=False):
+    """Command line and environment for one stage process."""
+    env = dict(os.environ, CYBERRISK_STAGE=stage.name, CYBERRISK_RUN_ID=run_id,
+               CYBERRISK_STAGE_STARTED=repr(time.time()), CYBERRISK_APPEND="1" if append else "0")
+    command = [sys.executable, stage.script]
+    if stage.name in profile or "all" in profile:
+        if profiler == "py-spy":
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            output = os.path.join(PROFILE_DIR, f"{run_id}-{stage.name}.speedscope.json")
+            command = ["py-spy", "record", "--format", "speedscope", "-o", output, "--"] + command
+        else:
+            env["CYBERRISK_PROFILE"] = stage.name
+    return command, env
+
+
+def run_stage(stage, run_id, profile=(), profiler="cprofile", append=False):
+    command, env = stage_command(stage, run_id, profile, profiler, append)
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    return result, time.perf_counter() - start
+
+
+def run(stages, force=False, jobs=None, dry_run=False, profile=(), profiler="cprofile", append=False):
+    """Run stale stages in dependency order; returns the names of failed stages."""
+    run_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+    state = load_state()
+    graph = build_graph(stages)
+    by_name = {s.name: s for s in stages}
+    pending = dict(graph)
+    done, failed, running, fingerprints, codes, refits = set(), set(), {}, {}, {}, {}
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while pending or running:
+            ready = [n for n, deps in pending.items() if deps <= done]
+            blocked = [n for n, deps in pending.items() if deps & failed]
+            for name in blocked:
+                print(f"⏭️ {name}: skipped (upstream failed)")
+                failed.add(name)
+                del pending[name]
+
+            for name in ready:
+                del pending[name]
+                stage = by_name[name]
+                inputs_ready = all(os.path.exists(os.path.join(ROOT, p)) for p in stage.fingerprint_paths())
+                fingerprints[name] = fingerprint(stage) if inputs_ready else None
+                codes[name] = fingerprint(stage, stage.code_paths()) if inputs_ready else None
+                refit_paths = stage.refit_paths()
+                refits[name] = (fingerprint(stage, refit_paths) if refit_paths and all(
+                    os.path.exists(os.path.join(ROOT, p)) for p in refit_paths) else None)
+                rows = append and not force and can_append(stage, state, codes[name])
+                mode = " (append)" if rows else ""
+                if not force and is_fresh(stage, state, fingerprints[name]):
+                    print(f"✅ {name}: up to date")
+                    done.add(name)
+                elif append and stage.append == "keep" and outputs_exist(stage):
+                    print(f"⏭️ {name}: kept (append mode; run without --append to update)")
+                    done.add(name)
+                elif not force and can_keep(stage, state, refits[name]):
+                    print(f"⏭️ {name}: kept (only dimension data changed; --force {name} to rerun)")
+                    done.add(name)
+                elif dry_run:
+                    print(f"🔁 {name}: would run {stage.script}{mode}")
+                    done.add(name)
+                else:
+                    print(f"▶️ {name}: running {stage.script}{mode}")
+                    running[pool.submit(run_stage, stage, run_id, profile, profiler, rows)] = name
+
+            if not running:
+                if pending and not ready and not blocked:
+                    raise RuntimeError(f"Dependency cycle among stages: {', '.join(pending)}")
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                result, elapsed = future.result()
+                if result.returncode == 0:
+                    state[name] = {"fingerprint": fingerprints[name], "code": codes[name], "refit": refits[name],
+                                   "finished_at": time.time()}
+                    save_state(state)
+                    print(f"✅ {name}: done in {elapsed:.1f}s")
+                    done.add(name)
+                else:
+                    print(f"❌ {name}: failed (exit {result.returncode})")
+                    print(result.stderr.strip())
+                    failed.add(name)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the pipeline stages that are out of date.")
+    parser.add_argument("stages", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="rerun stages even if their inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="maximum number of stages to run in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="only show which stages would run")
+    parser.add_argument("--profile", nargs="+", default=[], metavar="STAGE",
+                        help="profile these stages ('all' for every stage); output goes to .profiles/")
+    parser.add_argument("--profiler", choices=["cprofile", "py-spy"], default="cprofile",
+                        help="cprofile writes .prof files; py-spy (if installed) samples into speedscope JSON")
+    parser.add_argument("--append", action="store_true",
+                        help="only recompute country-years whose inputs changed, keeping the trained model")
+    args = parser.parse_args(argv)
+
+    failed = run(select(STAGES, args.stages), force=args.force, jobs=args.jobs, dry_run=args.dry_run,
+                 profile=args.profile, profiler=args.profiler, append=args.append)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+import argparse
+import json
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ingest import file_sha256
+from instrument import ROOT
+
+# === Dataset profiler
+# `python profiler.py [PATHS...]` profiles every data file (CSV, xlsx,
+# Parquet, Arrow) under the given paths — the repo by default — in parallel
+# on a process pool, and writes one JSON report that the dashboard's Data
+# Profile page shows. Three modes:
+#   meta    no data is parsed: CSV row counts are estimated from the file
+#           size and the line length of its first block, xlsx dimensions
+#           come from the sheet's <dimension> tag, Parquet and Arrow from
+#           their footer / batch metadata (null counts included)
+#   sample  every k-th row, about SAMPLE_ROWS of them, k from the metadata
+#           row count; non-null counts and rows by year are scaled to the
+#           row count (distinct countries by year are the sample's own)
+#   full    every row
+# The CSV export of a stored stage output (`x.csv` next to `x.parquet`) is
+# skipped unless --all is given. Profiles are cached under CACHE_DIR by
+# file content (SHA-256) and mode, so copies of a file share one profile;
+# a path whose mtime and size are unchanged is not even re-hashed.
+
+REPORT_FILE = os.environ.get("CYBERRISK_PROFILE_REPORT", os.path.join(ROOT, "profile_report.json"))
+CACHE_DIR = os.environ.get("CYBERRISK_PROFILE_CACHE_DIR", os.path.join(".cache", "profiles"))
+SAMPLE_ROWS = int(os.environ.get("CYBERRISK_PROFILE_SAMPLE_ROWS", "10000"))
+MODES = ["meta", "sample", "full"]
+# Part of the cache key: bump when a mode's profile changes
+PROFILE_VERSION = 2
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".xlsx": "xlsx",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+}
+TYPED = [".parquet", ".arrow"]
+META_BLOCK_BYTES = 1 << 16
+XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+# First matching column of each kind is used for the by-year matrices
+YEAR_COLUMNS = ["Year", "year"]
+COUNTRY_COLUMNS = ["ISO3", "Code", "Country Code", "country"]
+
+
+# === File discovery
+
+def discover(paths, include_exports=False):
+    """Data files under `paths`; returns (files, skipped CSV exports)."""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+            found.extend(os.path.join(root, f) for f in sorted(files) if os.path.splitext(f)[1] in EXTENSIONS)
+
+    files, skipped = [], []
+    for path in dict.fromkeys(os.path.normpath(p) for p in found):
+        stem, ext = os.path.splitext(path)
+        if not include_exports and ext == ".csv" and any(os.path.exists(stem + t) for t in TYPED):
+            skipped.append(path)
+        else:
+            files.append(path)
+    return files, skipped
+
+
+# === Metadata only
+
+def csv_meta(path):
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        block = f.read(META_BLOCK_BYTES)
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    lines = block.count(b"\n") + (0 if block.endswith(b"\n") or not block else 1)
+    if len(block) == size:
+        return max(lines - 1, 0), False, columns
+    if b"\n" not in block:
+        return None, True, columns
+    # Whole lines in the block only; the rest of the file is assumed alike
+    lines = block.count(b"\n")
+    return max(round(size * lines / (block.rindex(b"\n") + 1)) - 1, 0), True, columns
+
+
+def column_number(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def first_sheet(z):
+    """Zip member of a workbook's first sheet (the one pandas reads by default)."""
+    workbook = z.read("xl/workbook.xml").decode("utf-8")
+    rels = z.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+    rel_id = re.search(r'<sheet\b[^>]*\br:id="([^"]+)"', workbook).group(1)
+    target = re.search(rf'<Relationship\b[^>]*\bId="{rel_id}"[^>]*\bTarget="([^"]+)"', rels)
+    target = target or re.search(rf'<Relationship\b[^>]*\bTarget="([^"]+)"[^>]*\bId="{rel_id}"', rels)
+    sheet = target.group(1).lstrip("/")
+    return sheet if sheet.startswith("xl/") else f"xl/{sheet}"
+
+
+def xlsx_meta(path):
+    """(rows, columns) of the first sheet from its <dimension> tag, without parsing the sheet."""
+    with zipfile.ZipFile(path) as z:
+        with z.open(first_sheet(z)) as f:
+            head = f.read(META_BLOCK_BYTES)
+    match = re.search(rb'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"', head)
+    if match is None:
+        return None, None
+    first_col, first_row, last_col, last_row = match.groups()
+    last_col, last_row = last_col or first_col, last_row or first_row
+    rows = int(last_row) - int(first_row)  # minus the header row
+    return rows, column_number(last_col.decode()) - column_number(first_col.decode()) + 1
+
+
+def parquet_meta(path):
+    meta = pq.ParquetFile(path).metadata
+    columns = [meta.schema.column(i).name for i in range(meta.num_columns)]
+    non_null = {}
+    for i, col in enumerate(columns):
+        stats = [meta.row_group(g).column(i).statistics for g in range(meta.num_row_groups)]
+        if all(s is not None and s.has_null_count for s in stats):
+            non_null[col] = meta.num_rows - sum(s.null_count for s in stats)
+    return meta.num_rows, columns, non_null or None
+
+
+def arrow_meta(path):
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()  # memory-mapped: no column data is copied
+        return table.num_rows, table.column_names, {c: table.num_rows - table[c].null_count for c in table.column_names}
+
+
+def profile_meta(path, fmt):
+    profile = {"rows_estimated": False, "columns": None, "non_null": None}
+    if fmt == "csv":
+        profile["rows"], profile["rows_estimated"], profile["columns"] = csv_meta(path)
+    elif fmt == "xlsx":
+        profile["rows"], profile["n_columns"] = xlsx_meta(path)
+    elif fmt == "parquet":
+        profile["rows"], profile["columns"], profile["non_null"] = parquet_meta(path)
+    else:
+        profile["rows"], profile["columns"], profile["non_null"] = arrow_meta(path)
+    return profile
+
+
+# === Sampled / full read
+
+# A lean sheet reader: openpyxl builds a rich-text object per shared string,
+# which alone takes seconds on the UMD workbook. Values are read as text or
+# float (dates stay serial numbers), which is all a profile needs.
+
+def shared_strings(z):
+    if "xl/sharedStrings.xml" not in z.namelist():
+        return []
+    strings = []
+    with z.open("xl/sharedStrings.xml") as f:
+        for _, el in ElementTree.iterparse(f):
+            if el.tag == f"{XLSX_NS}si":
+                # Plain (<t>) or rich text (<r><t>); phonetic runs (<rPh>) are not part of the value
+                runs = [el] + el.findall(f"{XLSX_NS}r")
+                strings.append("".join(t.text or "" for r in runs for t in r.findall(f"{XLSX_NS}t")))
+                el.clear()
+    return strings
+
+
+def cell_value(c, strings):
+    kind, v = c.get("t"), c.find(f"{XLSX_NS}v")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in c.iter(f"{XLSX_NS}t"))
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return strings[int(v.text)]
+    if kind in ("str", "e"):
+        return v.text
+    if kind == "b":
+        return v.text == "1"
+    return float(v.text)
+
+
+def sheet_rows(path, step=1):
+    """Rows of the first sheet as {column position: value} dicts.
+
+    With `step` > 1 only the header and every `step`-th row after it are
+    decoded; the others are parsed past and yield nothing.
+    """
+    with zipfile.ZipFile(path) as z:
+        strings = shared_strings(z)
+        with z.open(first_sheet(z)) as f:
+            index = -1
+            for _, el in ElementTree.iterparse(f):
+                if el.tag != f"{XLSX_NS}row":
+                    continue
+                index += 1
+                if index and (index - 1) % step:
+                    el.clear()
+                    continue
+                row, position = {}, 0
+                for c in el.iter(f"{XLSX_NS}c"):
+                    ref = c.get("r")
+                    position = column_number(ref.rstrip("0123456789")) - 1 if ref else position
+                    value = cell_value(c, strings)
+                    if value is not None:
+                        row[position] = value
+                    position += 1
+                el.clear()
+                yield row
+
+
+def read_sheet(path, step=1):
+    rows = sheet_rows(path, step)
+    header = next(rows, {})
+    data = [r for r in rows if r]
+    width = max([max(header, default=-1)] + [max(r) for r in data]) + 1
+    columns = [str(header[i]) if i in header else f"Unnamed: {i}" for i in range(width)]
+    return pd.DataFrame.from_records([[r.get(i) for i in range(width)] for r in data], columns=columns)
+
+
+def read_rows(path, fmt, step=1):
+    """Every `step`-th row of a file."""
+    if fmt == "csv":
+        return pd.read_csv(path, skiprows=(lambda i: i % step != 0) if step > 1 else None, low_memory=False)
+    if fmt == "xlsx":
+        return read_sheet(path, step)
+    df = pd.read_parquet(path) if fmt == "parquet" else pd.read_feather(path)
+    return df.iloc[::step] if step > 1 else df
+
+
+def first_column(df, candidates):
+    return next((c for c in candidates if c in df.columns), None)
+
+
+def frame_profile(df, scale=1.0):
+    """Null counts, per-row non-null histogram and by-year matrices of a (sampled) frame."""
+    non_null = df.notnull()
+    per_row = non_null.sum(axis=1).value_counts().sort_index()
+    profile = {
+        "columns": [str(c) for c in df.columns],
+        "non_null": {str(c): round(n * scale) for c, n in non_null.sum().items()},
+        "non_null_per_row": {int(k): round(n * scale) for k, n in per_row.items()},
+    }
+
+    year_col = first_column(df, YEAR_COLUMNS)
+    years = pd.to_numeric(df[year_col], errors="coerce") if year_col else None
+    if years is None or years.notna().sum() == 0:
+        return profile
+    years = years.astype("Int64")
+    profile["year_column"] = year_col
+    profile["rows_by_year"] = {int(y): round(n * scale) for y, n in years.value_counts().sort_index().items()}
+    # Share of missing values per column and year (matrix: column -> year -> share)
+    null_share = (~non_null).groupby(years).mean()
+    profile["null_share_by_year"] = {
+        str(col): {int(y): round(float(v), 4) for y, v in null_share[col].items()} for col in null_share.columns
+    }
+    country_col = first_column(df, COUNTRY_COLUMNS)
+    if country_col:
+        profile["country_column"] = country_col
+        countries = df[country_col].groupby(years).nunique()
+        profile["countries_by_year"] = {int(y): int(n) for y, n in countries.items()}
+    return profile
+
+
+def profile_file(path, mode="sample", sample_rows=SAMPLE_ROWS):
+    """Profile of one data file (runs inside a worker)."""
+    start = time.perf_counter()
+    fmt = EXTENSIONS[os.path.splitext(path)[1]]
+    profile = {"format": fmt, "bytes": os.path.getsize(path), "mode": mode}
+    try:
+        profile.update(profile_meta(path, fmt))
+        if mode != "meta":
+            rows = profile["rows"]
+            step = max(1, -(-rows // sample_rows)) if mode == "sample" and rows else 1
+            df = read_rows(path, fmt, step)
+            # A read that covered the whole file gives the exact row count
+            if step == 1:
+                profile["rows"], profile["rows_estimated"] = len(df), False
+            else:
+                profile["sample_step"] = step
+            profile["sampled_rows"] = len(df)
+            profile.update(frame_profile(df, scale=(profile["rows"] or 0) / max(len(df), 1)))
+        if profile.get("columns") is not None:
+            profile["n_columns"] = len(profile["columns"])
+    except Exception as e:
+        profile["error"] = f"{type(e).__name__}: {e}"
+    profile["seconds"] = round(time.perf_counter() - start, 4)
+    return profile
+
+
+# === Content-addressed cache
+
+def cache_path(sha, mode, sample_rows):
+    suffix = f"{mode}-{sample_rows}" if mode == "sample" else mode
+    return os.path.join(CACHE_DIR, f"{sha[:24]}-v{PROFILE_VERSION}-{suffix}.json")
+
+
+def read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(data, path):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def profile_task(path, mode, sample_rows, sha=None):
+    """(sha, profile, cache) for one file: hashes it if needed, then profiles it unless cached."""
+    sha = sha or file_sha256(path)
+    cached = read_json(cache_path(sha, mode, sample_rows))
+    if cached is not None:
+        return sha, cached, "hit"
+    profile = profile_file(path, mode, sample_rows)
+    if "error" not in profile:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_json(profile, cache_path(sha, mode, sample_rows))
+    return sha, profile, "miss"
+
+
+def run(paths=(ROOT,), mode="sample", workers=None, sample_rows=SAMPLE_ROWS, include_exports=False):
+    """Profile every data file under `paths`; returns the report."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode!r} (expected one of {MODES})")
+    start = time.perf_counter()
+    files, skipped = discover(paths, include_exports)
+
+    # Paths whose mtime and size match the index keep their hash
+    index_path = os.path.join(CACHE_DIR, "index.json")
+    index = {p: e for p, e in (read_json(index_path) or {}).items() if os.path.exists(p)}
+    known = {}
+    for path in files:
+        stat, entry = os.stat(path), index.get(os.path.abspath(path))
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            known[path] = entry["sha256"]
+
+    results = {}
+    pending = []
+    for path in files:
+        sha = known.get(path)
+        cached = read_json(cache_path(sha, mode, sample_rows)) if sha else None
+        if cached is not None:
+            results[path] = (sha, cached, "hit")
+        else:
+            pending.append(path)
+
+    if pending:
+        pending.sort(key=os.path.getsize, reverse=True)  # largest first keeps the pool busy
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(profile_task, path, mode, sample_rows, known.get(path)) for path in pending}
+            results.update((path, f.result()) for path, f in futures.items())
+
+    for path, (sha, _, _) in results.items():
+        stat = os.stat(path)
+        index[os.path.abspath(path)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_json(index, index_path)
+
+    profiles = []
+    for path in files:
+        sha, profile, cache = results[path]
+        profiles.append(dict(profile, path=os.path.relpath(path, ROOT), sha256=sha, cache=cache))
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mode": mode,
+        "sample_rows": sample_rows if mode == "sample" else None,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "files": profiles,
+        "skipped_exports": [os.path.relpath(p, ROOT) for p in skipped],
+    }
+
+
+def print_report(report):
+    for p in report["files"]:
+        if "error" in p:
+            print(f"❌ {p['path']} — {p['error']}")
+            continue
+        rows = "?" if p.get("rows") is None else f"{'~' if p.get('rows_estimated') else ''}{p['rows']:,}"
+        cols = p.get("n_columns", "?")
+        line = f"📂 {p['path']} — {rows} rows × {cols} columns ({p['format']}, {p['seconds']:.2f}s, cache {p['cache']})"
+        if p.get("non_null") and p.get("rows"):
+            worst = min(p["non_null"].items(), key=lambda kv: kv[1])
+            line += f", sparsest: {worst[0]} {worst[1] / p['rows']:.0%} non-null"
+        print(line)
+    if report["skipped_exports"]:
+        print(f"⏭️ Skipped {len(report['skipped_exports'])} CSV exports of stored stage outputs (--all to include)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the data files: rows, nulls and year coverage.")
+    parser.add_argument("paths", nargs="*", default=[ROOT], help="files or directories (default: the repo)")
+    parser.add_argument("--mode", choices=MODES, default="sample")
+    parser.add_argument("--sample-rows", type=int, default=SAMPLE_ROWS)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--all", action="store_true", help="also profile the CSV exports of stored stage outputs")
+    parser.add_argument("--output", default=REPORT_FILE)
+    args = parser.parse_args(argv)
+
+    report = run(args.paths, args.mode, args.workers, args.sample_rows, include_exports=args.all)
+    print_report(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    hits = sum(p["cache"] == "hit" for p in report["files"])
+    print(f"✅ Profiled {len(report['files'])} files ({report['mode']}, {hits} from cache) "
+          f"in {report['wall_seconds']:.2f}s → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
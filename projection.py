@@ -0,0 +1,125 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# === Feature projection engine
+# Extrapolates each country's recent feature history over a horizon in one
+# vectorized pass. The history is packed into a (countries, steps, features)
+# array — one step per observed row, NaN-padded — and every extrapolator
+# maps that array to a (countries, horizon, features) array. Extrapolators
+# are registered in EXTRAPOLATORS and selected by name. A panel.Panel packs
+# the same layout straight from its cube (Panel.pack, project_packed).
+
+HORIZON = list(range(2025, 2031))
+DAMPING = 0.8
+RIDGE_ALPHA = 1.0
+
+
+def pack_history(history, features, key="ISO3", time="Year", min_points=2):
+    """Pack a long history frame into per-key step arrays.
+
+    Returns (keys, times, values, lengths): times is (K, S), values is
+    (K, S, F), both NaN-padded after each key's `lengths[k]` rows.
+    """
+    history = history.sort_values([key, time], kind="stable")
+    codes, keys = pd.factorize(history[key], sort=False)
+    counts = np.bincount(codes, minlength=len(keys))
+
+    keep = counts >= min_points
+    rows = keep[codes]
+    codes = np.cumsum(keep)[codes[rows]] - 1
+    keys = keys[keep]
+    lengths = counts[keep]
+    steps = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+
+    n_keys, n_steps = len(keys), int(lengths.max()) if len(lengths) else 0
+    times = np.full((n_keys, n_steps), np.nan)
+    values = np.full((n_keys, n_steps, len(features)), np.nan)
+    times[codes, steps] = history[time].to_numpy(dtype=float)[rows]
+    values[codes, steps] = history[features].to_numpy(dtype=float)[rows]
+    return keys, times, values, lengths
+
+
+def last_step(times, values, lengths):
+    idx = np.arange(len(lengths))
+    return times[idx, lengths - 1], values[idx, lengths - 1]
+
+
+def mean_step(values):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN feature -> NaN slope
+        return np.nanmean(np.diff(values, axis=1), axis=1)
+
+
+# === Extrapolators: (times, values, lengths, horizon) -> (K, H, F)
+
+def linear(times, values, lengths, horizon):
+    """Last value plus the mean step-to-step change per elapsed year."""
+    last_time, base = last_step(times, values, lengths)
+    delta = mean_step(values)
+    elapsed = horizon[None, :] - last_time[:, None]
+    return base[:, None, :] + elapsed[:, :, None] * delta[:, None, :]
+
+
+def log_linear(times, values, lengths, horizon):
+    """Linear trend on log1p(values): constant growth rate instead of constant change."""
+    logged = np.log1p(np.clip(values, 0, None))
+    return np.expm1(linear(times, logged, lengths, horizon))
+
+
+def damped(times, values, lengths, horizon, damping=DAMPING):
+    """Linear trend whose yearly step shrinks by `damping` each year."""
+    last_time, base = last_step(times, values, lengths)
+    delta = mean_step(values)
+    elapsed = horizon[None, :] - last_time[:, None]
+    factor = damping * (1 - damping ** elapsed) / (1 - damping)
+    return base[:, None, :] + factor[:, :, None] * delta[:, None, :]
+
+
+def ridge(times, values, lengths, horizon, alpha=RIDGE_ALPHA):
+    """Per-country, per-feature ridge regression of value on time."""
+    valid = ~np.isnan(values)
+    t = np.where(valid, times[:, :, None], np.nan)
+    n = valid.sum(axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        t_mean = np.nanmean(t, axis=1)
+        v_mean = np.nanmean(values, axis=1)
+    tc = np.where(valid, t - t_mean[:, None, :], 0.0)
+    vc = np.where(valid, values - v_mean[:, None, :], 0.0)
+    slope = (tc * vc).sum(axis=1) / ((tc ** 2).sum(axis=1) + alpha)
+    slope = np.where(n >= 2, slope, np.nan)
+    return v_mean[:, None, :] + (horizon[None, :, None] - t_mean[:, None, :]) * slope[:, None, :]
+
+
+EXTRAPOLATORS = {
+    "linear": linear,
+    "log_linear": log_linear,
+    "damped": damped,
+    "ridge": ridge,
+}
+
+
+def project(history, features, horizon=HORIZON, method="linear", key="ISO3", time="Year",
+            min_points=2, floor=0.0):
+    """Future feature frame: one row per (key, horizon step), values floored at `floor`."""
+    packed = pack_history(history, features, key, time, min_points)
+    return project_packed(packed, features, horizon, method, key, time, floor)
+
+
+def project_packed(packed, features, horizon=HORIZON, method="linear", key="ISO3", time="Year", floor=0.0):
+    """project() for an already packed history (pack_history or panel.Panel.pack)."""
+    if method not in EXTRAPOLATORS:
+        raise ValueError(f"Unknown extrapolator: {method!r} (expected one of {sorted(EXTRAPOLATORS)})")
+    horizon = np.asarray(horizon)
+
+    keys, times, values, lengths = packed
+    projected = EXTRAPOLATORS[method](times, values, lengths, horizon.astype(float))
+    if floor is not None:
+        projected = np.maximum(projected, floor)  # NaN stays NaN
+
+    future = pd.DataFrame(projected.reshape(-1, len(features)), columns=features)
+    future.insert(0, time, np.tile(horizon, len(keys)))
+    future.insert(0, key, np.repeat(np.asarray(keys), len(horizon)))
+    return future
@@ -0,0 +1,126 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from classify import GDP_TIER_LABELS, NET_GROUP_LABELS, RISK_LABELS, UNKNOWN
+
+# === Column schema for stored and loaded frames
+# One declared dtype per known column: low-cardinality labels are
+# categoricals, Year is int16 and the metrics are float32 (7 significant
+# digits is plenty for every indicator we chart). apply_schema() is called
+# by datastore on every save and load. Stored files and pipeline stages keep
+# the metrics as float64 (compact=False), so no stage computes from rounded
+# values and the CSV export holds the same numbers as the typed file; the
+# dashboard loads them as float32. Columns not listed here are left as they
+# are. Run `python schema.py` for a before/after memory report of the
+# stored datasets.
+
+FLOAT = "float32"
+WIDE_FLOAT = "float64"
+
+TRANSPARENCY_LABELS = ["Normal", "Suspicious Underreporting"]
+
+# Categoricals: a fixed category list, or None to take the values present
+CATEGORIES = {
+    "ISO3": None,
+    "Decade": None,
+    "GDP_Tier": GDP_TIER_LABELS + [UNKNOWN],
+    "Net_Group": NET_GROUP_LABELS + [UNKNOWN],
+    "Risk_Class": RISK_LABELS,
+    "Transparency_Flag": TRANSPARENCY_LABELS,
+}
+
+SCHEMA = {
+    "Year": "int16",
+    **{col: "category" for col in CATEGORIES},
+    **{col: FLOAT for col in [
+        # raw indicators
+        "Attack_Count", "GDP_USD", "GDP_per_capita_USD", "Internet_Penetration",
+        "Cellular Subscription", "No. of Internet Users", "Broadband Subscription",
+        "Population", "Population Growth", "Growth Rate (%)",
+        # derived features (features.py)
+        "Penetration_Index", "Digital_Exposure_Index", "Digital_Exposure_Index_B",
+        "Economic_Exposure", "Log_Economic_Exposure", "Connectivity_Score",
+        "Attack_Density", "Growth_Adjusted_Risk", "Adjusted_Threat_Index",
+        "Log_Population", "Log_Attack_Count", "Log_GDP_USD", "Log_Internet_Users",
+        # normalized features
+        "Adjusted_Threat_Index_Norm", "Attack_Density_Norm", "Growth_Adjusted_Risk_Norm",
+        "Connectivity_Score_Norm", "Digital_Exposure_Index_Norm", "GDP_USD_Norm",
+        "Internet_Penetration_Norm",
+        # predictions and custom metrics
+        "Predicted_Attack_Count", "Prediction_Error", "Abs_Error", "Z_Error",
+        "GDP_Risk_Ratio", "Log_Predicted_Attack_Count", "Log_GDP_Risk_Ratio",
+    ]},
+}
+
+
+def category_dtype(col):
+    categories = CATEGORIES.get(col)
+    return "category" if categories is None else pd.CategoricalDtype(categories)
+
+
+def apply_schema(df, compact=True):
+    """Cast the known columns of `df` to their declared dtypes (returns a new frame).
+
+    With compact=False the float metrics are cast to float64 instead of
+    float32 (categoricals and Year are lossless either way).
+    """
+    casts = {}
+    for col in df.columns:
+        dtype = SCHEMA.get(col)
+        if dtype is None:
+            continue
+        if dtype == FLOAT and not compact:
+            dtype = WIDE_FLOAT
+        if dtype == "category":
+            dtype = category_dtype(col)
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and (
+                    dtype == "category" or df[col].dtype == dtype):
+                continue
+        elif df[col].dtype == dtype:
+            continue
+        elif dtype.startswith("int") and df[col].isna().any():
+            dtype = dtype.replace("int", "Int")  # nullable integer keeps the NaNs
+        casts[col] = dtype
+    return df.astype(casts) if casts else df
+
+
+def expand(df):
+    """The same frame with default dtypes (float64 / int64 / object), as read from CSV."""
+    casts = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+            casts[col] = object
+        elif pd.api.types.is_float_dtype(dtype):
+            casts[col] = np.float64
+        elif pd.api.types.is_integer_dtype(dtype):
+            casts[col] = np.int64 if not df[col].isna().any() else np.float64
+    return df.astype(casts)
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(df):
+    """Memory use of `df` with default dtypes versus the schema."""
+    before, after = memory_bytes(expand(df)), memory_bytes(apply_schema(df))
+    return {"rows": len(df), "columns": df.shape[1], "before_bytes": before,
+            "after_bytes": after, "ratio": round(before / after, 2) if after else None}
+
+
+if __name__ == "__main__":
+    from datastore import load_frame
+
+    names = sys.argv[1:] or ["merged_df", "merged_fully_enriched", "merged_with_predictions",
+                             "predictions_enriched", "future_predictions"]
+    print(f"{'dataset':<26}{'rows':>7}{'cols':>6}{'before MB':>11}{'after MB':>10}{'ratio':>7}")
+    for name in names:
+        try:
+            report = memory_report(load_frame(name, compact=False))
+        except FileNotFoundError:
+            print(f"{name:<26}  (not built)")
+            continue
+        print(f"{name:<26}{report['rows']:>7}{report['columns']:>6}"
+              f"{report['before_bytes'] / 1e6:>11.2f}{report['after_bytes'] / 1e6:>10.2f}{report['ratio']:>6.1f}x")
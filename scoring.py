@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+from modeling import FEATURES, MODEL_NAME, clean_features, frame_hash, latest_meta, load_model
+
+# === Batch scoring service
+# Loads the registered model once per process and scores whole batches of
+# feature rows with a single vectorized predict call. Results are cached by
+# a hash of the (cleaned) input rows, so re-scoring an unchanged scenario
+# is a dictionary lookup.
+
+CACHE_SIZE = 256
+
+
+class Scorer:
+    def __init__(self, model, meta, cache_size=CACHE_SIZE):
+        self.model = model
+        self.meta = meta
+        self.features = meta.get("features", FEATURES)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()  # dashboard sessions share one scorer
+
+    @classmethod
+    def from_registry(cls, name=MODEL_NAME, version=None, cache_size=CACHE_SIZE):
+        model, meta = load_model(name, version)
+        return cls(model, meta, cache_size)
+
+    @property
+    def version(self):
+        return self.meta["version"]
+
+    def score(self, frame):
+        """Predicted attack counts for every row of `frame` (needs the model's features)."""
+        X = clean_features(frame[self.features])
+        key = frame_hash(X)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key]
+            self.misses += 1
+
+        predictions = self.model.predict(X)
+        predictions.flags.writeable = False  # cached arrays are shared between callers
+        with self.lock:
+            self.cache[key] = predictions
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return predictions
+
+
+_scorers = {}
+
+
+def get_scorer(name=MODEL_NAME):
+    """Process-wide scorer for the latest registered version of a model."""
+    meta = latest_meta(name)
+    if meta is None:
+        raise FileNotFoundError(f"No trained model {name!r} — run 3train_model.py first")
+    scorer = _scorers.get(name)
+    if scorer is None or scorer.version != meta["version"]:
+        scorer = _scorers[name] = Scorer.from_registry(name, meta["version"])
+    return scorer
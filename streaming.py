@@ -0,0 +1,83 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from ingest import iter_workbook_chunks
+from iso3 import resolve_iso3
+
+# === Chunked incident counting and indexed dimension joins
+# Incident sources (xlsx, csv or parquet) are read a chunk at a time; each
+# chunk is resolved to ISO3 and reduced to per-(ISO3, Year) counts that are
+# added to a running total, so memory is bounded by the number of
+# country-years, not incidents. The small dimension tables (GDP, internet,
+# population) are indexed once on (ISO3, Year) and joined by reindexing
+# onto the combined key index, instead of a chain of outer merges that
+# each copy the whole frame.
+
+CHUNK_ROWS = int(os.environ.get("CYBERRISK_CHUNK_ROWS", "50000"))
+# Further incident files (.xlsx / .csv / .parquet with country + year columns), os.pathsep-separated
+INCIDENT_SOURCES = [p for p in os.environ.get("CYBERRISK_INCIDENT_SOURCES", "").split(os.pathsep) if p]
+KEYS = ["ISO3", "Year"]
+
+
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Frames of at most `chunk_rows` rows of the given columns of an incident file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        yield from iter_workbook_chunks(path, columns=columns, chunk_rows=chunk_rows)
+    elif ext == ".csv":
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+    elif ext == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported incident source: {path!r} (expected .xlsx, .csv or .parquet)")
+
+
+def count_incidents(chunks, country="country", year="year"):
+    """Attack_Count per (ISO3, Year) over a stream of incident frames.
+
+    Returns (counts, unresolved, rows): the counts frame sorted by key, the
+    rows per unresolvable country name, and the number of incidents read.
+    """
+    totals, unresolved, rows = None, [], 0
+    for chunk in chunks:
+        rows += len(chunk)
+        chunk = chunk[[country, year]].dropna()
+        iso3, failed = resolve_iso3(chunk[country])
+        keys = pd.DataFrame({"ISO3": iso3, "Year": chunk[year]}).dropna().astype({"Year": int})
+        counts = keys.groupby(KEYS).size()
+        totals = counts if totals is None else totals.add(counts, fill_value=0)
+        unresolved.append(failed)
+
+    if totals is None:
+        return pd.DataFrame(columns=KEYS + ["Attack_Count"]), pd.Series(dtype="int64"), rows
+    counts = totals.astype("int64").rename("Attack_Count").sort_index().reset_index()
+    unresolved = pd.concat(unresolved).groupby(level=0).sum().sort_values(ascending=False)
+    return counts, unresolved, rows
+
+
+def index_dimension(df, keys=KEYS):
+    """A dimension table indexed on its keys (first row wins for duplicate keys)."""
+    indexed = df.set_index(keys)
+    if not indexed.index.is_unique:
+        indexed = indexed[~indexed.index.duplicated()]
+    return indexed
+
+
+def lookup_join(base, dimensions, keys=KEYS, years=None):
+    """Outer join of `base` with the dimension tables on `keys`, optionally within a year range.
+
+    Every frame is indexed once; the result holds one row per key present in
+    any of them (sorted by key), as a chain of outer merges would.
+    """
+    frames = [base] + list(dimensions)
+    if years is not None:
+        frames = [f[f["Year"].between(*years)] for f in frames]
+    indexed = [index_dimension(f.astype({"Year": "int64"}), keys) for f in frames]
+
+    index = indexed[0].index
+    for table in indexed[1:]:
+        index = index.union(table.index)
+    return pd.concat([table.reindex(index) for table in indexed], axis=1).reset_index()
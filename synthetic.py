@@ -0,0 +1,261 @@
+import argparse
+import itertools
+import json
+import os
+import string
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pycountry
+
+from ingest import UMD_WORKBOOK, read_workbook
+from iso3 import load_aliases
+from pipeline import GDP_CSV, INTERNET_CSV, POPULATION_CSV
+
+# === Synthetic source data for load testing
+# Writes stand-ins for the four pipeline inputs (UMD workbook, GDP,
+# internet and population CSVs) with exactly the columns 1incidents.py
+# and 1merge.py read, at any number of regions, years and incidents.
+# Regions are the real countries first, then made-up codes (XAA, XAB,
+# ...), whose names are added to an iso3_aliases.json written next to the
+# data (point CYBERRISK_ISO3_ALIASES at it). Indicator series follow
+# simple per-region models fitted to the bundled data: log-normal
+# population and GDP per capita with yearly growth noise, and logistic
+# adoption curves for internet, cellular and broadband. Incidents reuse
+# the real workbook's actor / industry / event mix and fall on regions in
+# proportion to their online economy. Output depends only on the
+# arguments and the seed.
+
+REGIONS = len(pycountry.countries)
+YEARS = (2000, 2024)
+INCIDENTS_PER_YEAR = 1250  # the UMD workbook averages ~1260 a year
+GRANULARITIES = ["year", "month", "day"]
+
+# Per-region models (fitted to the bundled CSVs)
+LOG_POPULATION = (15.6, 2.1)          # mean, std of ln(population)
+POPULATION_GROWTH_PCT = (1.5, 1.6)    # region's mean yearly growth (%)
+POPULATION_GROWTH_NOISE = 0.3         # year-to-year std (percentage points)
+LOG_GDP_PER_CAPITA = (8.2, 1.6)       # mean, std of ln(GDP per capita, USD)
+GDP_GROWTH = (0.04, 0.03)             # region's mean yearly growth, spread
+GDP_GROWTH_NOISE = 0.06
+GDP_MISSING = 0.05                    # share of country-years without GDP
+ADOPTION_MIDPOINT = (2010, 6)         # internet: year of 50% adoption
+ADOPTION_STEEPNESS = (0.2, 0.45)
+INTERNET_CEILING = (60, 100)          # % of population
+CELLULAR_CEILING = (70, 160)          # subscriptions per 100 people, ~5 years ahead of internet
+BROADBAND_CEILING = (3, 50)           # subscriptions per 100 people, ~3 years behind
+INCIDENT_SKEW = 0.9                   # weight = (GDP × internet share) ** skew; top region gets ~50%, as in UMD
+
+# Incident attributes sampled together from the real workbook
+TEMPLATE_COLUMNS = ["actor", "actor_type", "industry_code", "industry", "motive",
+                    "event_type", "event_subtype", "actor_country"]
+UMD_COLUMNS = ["slug", "event_date", "year", "month", "actor", "actor_type", "organization",
+               "industry_code", "industry", "motive", "event_type", "event_subtype",
+               "description", "source_url", "country", "actor_country"]
+
+
+def region_table(n):
+    """ISO3 codes and names of `n` regions: real countries first, then made-up codes."""
+    real = sorted(pycountry.countries, key=lambda c: c.alpha_3)
+    codes = [c.alpha_3 for c in real[:n]]
+    names = [c.name for c in real[:n]]
+    taken = {c.alpha_3 for c in real}
+    letters = string.ascii_uppercase
+    fake = ("".join(p) for size in itertools.count(3)
+            for p in itertools.product(letters, repeat=size) if p[0] == "X" or size > 3)
+    for code in fake:
+        if len(codes) >= n:
+            break
+        if code not in taken:
+            codes.append(code)
+            names.append(f"Synthetic Region {code}")
+    return pd.DataFrame({"ISO3": codes, "Name": names})
+
+
+def logistic(years, midpoint, steepness, ceiling):
+    return ceiling[:, None] / (1 + np.exp(-steepness[:, None] * (years[None, :] - midpoint[:, None])))
+
+
+def indicator_panel(regions, years, rng):
+    """Region × year indicators as a long frame (one row per region and year)."""
+    n, span = len(regions), len(years)
+
+    # Population: log-normal level, compounded yearly growth
+    growth_pct = rng.normal(*POPULATION_GROWTH_PCT, n)[:, None] + rng.normal(0, POPULATION_GROWTH_NOISE, (n, span))
+    growth_pct[:, 0] = 0
+    population = np.exp(rng.normal(*LOG_POPULATION, n))[:, None] * np.cumprod(1 + growth_pct / 100, axis=1)
+    population = np.maximum(population.round(), 1000)
+
+    # GDP per capita: log-normal level, compounded yearly growth
+    gdp_growth = rng.normal(*GDP_GROWTH, n)[:, None] + rng.normal(0, GDP_GROWTH_NOISE, (n, span))
+    gdp_growth[:, 0] = 0
+    gdp_per_capita = np.exp(rng.normal(*LOG_GDP_PER_CAPITA, n))[:, None] * np.cumprod(1 + gdp_growth, axis=1)
+
+    # Adoption curves
+    midpoint = rng.normal(*ADOPTION_MIDPOINT, n)
+    steepness = rng.uniform(*ADOPTION_STEEPNESS, n)
+    internet = logistic(years, midpoint, steepness, rng.uniform(*INTERNET_CEILING, n))
+    cellular = logistic(years, midpoint - 5, steepness, rng.uniform(*CELLULAR_CEILING, n))
+    broadband = logistic(years, midpoint + 3, steepness, rng.uniform(*BROADBAND_CEILING, n))
+
+    panel = pd.DataFrame({
+        "ISO3": np.repeat(regions["ISO3"].to_numpy(), span),
+        "Name": np.repeat(regions["Name"].to_numpy(), span),
+        "Year": np.tile(years, n),
+        "Population": population.ravel().astype(np.int64),
+        "GDP_per_capita_USD": gdp_per_capita.ravel(),
+        "Internet_Penetration": internet.ravel(),
+        "Cellular Subscription": cellular.ravel(),
+        "Broadband Subscription": broadband.ravel(),
+    })
+    panel["GDP_USD"] = panel["GDP_per_capita_USD"] * panel["Population"]
+    missing = rng.random(len(panel)) < GDP_MISSING
+    panel.loc[missing, ["GDP_USD", "GDP_per_capita_USD"]] = np.nan
+    return panel
+
+
+def population_csv(panel):
+    previous = panel.groupby("ISO3", sort=False)["Population"].shift()
+    return pd.DataFrame({
+        "Country": panel["Name"],
+        "ISO3": panel["ISO3"],
+        "Year": panel["Year"],
+        "Population": panel["Population"],
+        "Population Growth": panel["Population"] - previous,
+        "Growth Rate (%)": (panel["Population"] / previous - 1) * 100,
+        "Decade": (panel["Year"] // 10 * 10).astype(str) + "s",
+    })
+
+
+def gdp_csv(panel):
+    return pd.DataFrame({
+        "Country Name": panel["Name"],
+        "Country Code": panel["ISO3"],
+        "year": panel["Year"],
+        "GDP_USD": panel["GDP_USD"],
+        "GDP_per_capita_USD": panel["GDP_per_capita_USD"],
+    })
+
+
+def internet_csv(panel):
+    # The original file carries its pandas index as an unnamed first column
+    return pd.DataFrame({
+        "": np.arange(len(panel)),
+        "Entity": panel["Name"],
+        "Code": panel["ISO3"],
+        "Year": panel["Year"],
+        "Cellular Subscription": panel["Cellular Subscription"],
+        "Internet Users(%)": panel["Internet_Penetration"],
+        "No. of Internet Users": (panel["Internet_Penetration"] / 100 * panel["Population"]).round().astype(np.int64),
+        "Broadband Subscription": panel["Broadband Subscription"],
+    })
+
+
+def incident_dates(years, granularity, rng):
+    """ISO dates within each incident's year at the given granularity."""
+    starts = years.astype("U4").astype("datetime64[D]")  # Jan 1st
+    if granularity == "year":
+        return starts
+    months = rng.integers(0, 12, len(years))
+    month_starts = (years.astype("U4").astype("datetime64[M]") + months).astype("datetime64[D]")
+    if granularity == "month":
+        return month_starts
+    month_ends = (years.astype("U4").astype("datetime64[M]") + months + 1).astype("datetime64[D]")
+    days = (month_ends - month_starts).astype(np.int64)
+    return month_starts + (rng.random(len(years)) * days).astype(np.int64)
+
+
+def incidents(panel, per_year, granularity, rng, template):
+    """UMD-style incident rows for every year of the panel."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity!r} (expected one of {GRANULARITIES})")
+    weights = (panel["GDP_USD"].fillna(0) * panel["Internet_Penetration"] / 100) ** INCIDENT_SKEW
+
+    rows = []
+    for year, idx in panel.groupby("Year").indices.items():
+        count = rng.poisson(per_year)
+        p = weights.to_numpy()[idx]
+        p = p / p.sum() if p.sum() > 0 else None
+        rows.append(rng.choice(idx, size=count, p=p))
+    rows = np.concatenate(rows) if rows else np.array([], dtype=int)
+
+    n = len(rows)
+    years = panel["Year"].to_numpy()[rows]
+    dates = incident_dates(years, granularity, rng).astype(str)
+    slugs = [f"{v:016x}" for v in rng.integers(0, 2**63, n)]
+    sampled = template.iloc[rng.integers(0, len(template), n)].reset_index(drop=True)
+    organizations = [f"Organization {k}" for k in rng.integers(1, 50_000, n)]
+
+    df = pd.DataFrame({
+        "slug": slugs,
+        "event_date": dates,
+        "year": years.astype(str),
+        "month": pd.Series(dates).str[5:7].to_numpy(),
+        "organization": organizations,
+        "country": panel["Name"].to_numpy()[rows],
+        "source_url": [f"https://example.org/incidents/{slug}" for slug in slugs],
+    })
+    df = pd.concat([df, sampled], axis=1)
+    df["description"] = df["event_subtype"].astype(str) + " incident reported by " + df["organization"] + "."
+    return df.sort_values(["event_date", "slug"], kind="stable")[UMD_COLUMNS].reset_index(drop=True)
+
+
+def write_workbook(df, path, sheet="Sheet 1"):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet)
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([None if isinstance(v, float) and np.isnan(v) else v for v in row])
+    wb.save(path)
+
+
+def generate(out_dir, regions=REGIONS, years=YEARS, incidents_per_year=INCIDENTS_PER_YEAR,
+             granularity="month", seed=0):
+    """Write the four synthetic inputs (and an alias file) under `out_dir`; returns their paths."""
+    rng = np.random.default_rng(seed)
+    region_df = region_table(regions)
+    panel = indicator_panel(region_df, np.arange(years[0], years[1] + 1), rng)
+    template = read_workbook(UMD_WORKBOOK, columns=TEMPLATE_COLUMNS).dropna().reset_index(drop=True)
+    umd = incidents(panel, incidents_per_year, granularity, rng, template)
+
+    paths = {}
+    for path, frame in [(GDP_CSV, gdp_csv(panel)), (INTERNET_CSV, internet_csv(panel)),
+                        (POPULATION_CSV, population_csv(panel))]:
+        paths[path] = os.path.join(out_dir, path)
+        os.makedirs(os.path.dirname(paths[path]), exist_ok=True)
+        frame.to_csv(paths[path], index=False)
+
+    paths[UMD_WORKBOOK] = os.path.join(out_dir, UMD_WORKBOOK)
+    os.makedirs(os.path.dirname(paths[UMD_WORKBOOK]), exist_ok=True)
+    write_workbook(umd, paths[UMD_WORKBOOK])
+
+    aliases = dict(load_aliases())
+    synthetic = region_df[region_df["Name"].str.startswith("Synthetic Region ")]
+    aliases.update(zip(synthetic["Name"], synthetic["ISO3"]))
+    paths["aliases"] = os.path.join(out_dir, "iso3_aliases.json")
+    with open(paths["aliases"], "w", encoding="utf-8") as f:
+        json.dump(aliases, f, indent=2, ensure_ascii=False)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic pipeline inputs at any scale.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--regions", type=int, default=REGIONS)
+    parser.add_argument("--years", type=int, nargs=2, default=YEARS, metavar=("FIRST", "LAST"))
+    parser.add_argument("--incidents", type=int, default=INCIDENTS_PER_YEAR, help="mean incidents per year")
+    parser.add_argument("--granularity", choices=GRANULARITIES, default="month", help="incident date resolution")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Generating {args.regions} regions × {args.years[0]}–{args.years[1]}, "
+          f"~{args.incidents} incidents/year (seed {args.seed})...")
+    paths = generate(args.out_dir, args.regions, tuple(args.years), args.incidents, args.granularity, args.seed)
+    for path in paths.values():
+        print(f"✅ {path}")
+    print(f"ℹ️ Run the pipeline inside {args.out_dir} with CYBERRISK_ISO3_ALIASES={paths['aliases']}")
+
+
+if __name__ == "__main__":
+    main()